@@ -5,10 +5,29 @@ NEXUS Agents Module - Phase 3 Extended with Resonance
 __version__ = "3.1.0"
 __author__ = "NEXUS Bot"
 
-from .phase3.tester_agent import TesterAgent
-from .phase3.optimizer_agent import OptimizerAgent
-from .phase3.extended_evolution_loop import ExtendedEvolutionLoop
-from .phase3.resonant_analyzer import ResonantAnalyzerAgent, ResonatorTools
+import importlib
+
+# Public names are resolved on first access so importing the package (or one
+# submodule) does not pull in every agent and its dependencies.
+_LAZY = {
+    'TesterAgent': '.phase3.tester_agent',
+    'OptimizerAgent': '.phase3.optimizer_agent',
+    'ExtendedEvolutionLoop': '.phase3.extended_evolution_loop',
+    'ResonantAnalyzerAgent': '.phase3.resonant_analyzer',
+    'ResonatorTools': '.phase3.resonant_analyzer',
+}
 
 __all__ = ['TesterAgent', 'OptimizerAgent', 'ExtendedEvolutionLoop',
            'ResonantAnalyzerAgent', 'ResonatorTools']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
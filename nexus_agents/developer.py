@@ -7,25 +7,84 @@ Auto-fixing and PR generation
 
 import os
 import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    from .inbox import IssueInbox
+    from .state import state_path
+    from .streaming import JsonlSink
+except ImportError:
+    from inbox import IssueInbox
+    from state import state_path
+    from streaming import JsonlSink
+
+
+class IssueQueue:
+    """Shared work queue of issues with per-agent deques and work stealing
+
+    Items are dealt round-robin to one deque per agent. An agent takes from
+    the front of its own deque and, once it runs dry, steals from the back
+    of the fullest other deque. Every claim happens under one lock, so each
+    issue is handed out exactly once.
+    """
+
+    def __init__(self, items, num_workers):
+        self._deques = [deque() for _ in range(max(1, num_workers))]
+        for i, item in enumerate(items):
+            self._deques[i % len(self._deques)].append(item)
+        self._lock = threading.Lock()
+
+    def claim(self, worker):
+        """Next issue for a worker, or None when all work is taken"""
+        with self._lock:
+            own = self._deques[worker]
+            if own:
+                return own.popleft()
+            victim = max(self._deques, key=len)
+            if victim:
+                return victim.pop()
+            return None
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(d) for d in self._deques)
+
 
 class DeveloperAgent:
     """Single developer agent for fixes"""
 
-    def __init__(self, agent_id, repo_path="."):
+    def __init__(self, agent_id, repo_path=".", sink=None):
         self.id = agent_id
         self.repo_path = repo_path
         self.phi = 0.18
         self.fixes = []
+        self.sink = sink
+        self.inbox = IssueInbox(os.path.join(repo_path, ".github", "issues"),
+                                state_path(repo_path, "issue_inbox.json", create=False))
+
+    def list_issues(self):
+        """New or changed issue files since the last committed run, by name"""
+        try:
+            return [e["name"] for e in self.inbox.poll(commit=False)]
+        except Exception as e:
+            print(f"Error: {e}")
+            return []
 
     def analyze_issues(self):
         """Analyze repository issues"""
         try:
-            issues_dir = os.path.join(self.repo_path, ".github", "issues")
-            if os.path.exists(issues_dir):
-                return len(os.listdir(issues_dir))
+            return self.inbox.count()
+        except Exception as e:
+            print(f"Error: {e}")
             return 0
+
+    def count_new_issues(self):
+        """Issues new or changed since the last committed run; the cursor is not moved"""
+        try:
+            return len(self.inbox.peek())
         except Exception as e:
             print(f"Error: {e}")
             return 0
@@ -38,41 +97,80 @@ class DeveloperAgent:
             "timestamp": datetime.utcnow().isoformat(),
             "status": "proposed"
         }
-        self.fixes.append(fix)
+        if self.sink is not None:
+            self.sink.write(fix)
+        else:
+            self.fixes.append(fix)
         return fix
 
-    def run(self):
-        """Run developer agent"""
+    def run(self, queue=None, worker=0):
+        """Run developer agent, claiming issues from a shared queue if given"""
         print(f"[Agent-{self.id}] Analyzing...")
-        issues = self.analyze_issues()
-
-        if issues > 0:
-            for i in range(min(issues, 3)):
-                self.generate_fix(f"issue_{i}")
-
-        print(f"[Agent-{self.id}] Generated {len(self.fixes)} fixes")
-        return self.fixes
+        standalone = queue is None
+        if standalone:
+            queue = IssueQueue(self.list_issues(), 1)
+            worker = 0
+
+        fixes = []
+        generated = 0
+        while True:
+            issue = queue.claim(worker)
+            if issue is None:
+                break
+            fix = self.generate_fix(issue)
+            generated += 1
+            if self.sink is None:
+                fixes.append(fix)
+        if standalone:
+            self.inbox.commit()
+
+        print(f"[Agent-{self.id}] Generated {generated} fixes")
+        return fixes
 
 
 class DeveloperPool:
-    """Pool of developer agents"""
+    """Pool of developer agents
 
-    def __init__(self, num_agents=4, repo_path="."):
-        self.agents = [DeveloperAgent(i, repo_path) for i in range(num_agents)]
+    With a JsonlSink every fix is streamed to disk as soon as it is made and
+    nothing is collected in all_fixes.
+    """
+
+    def __init__(self, num_agents=4, repo_path=".", sink=None):
+        self.sink = sink
+        self.agents = [DeveloperAgent(i, repo_path, sink) for i in range(num_agents)]
         self.all_fixes = []
 
+    @classmethod
+    def streaming(cls, path, num_agents=4, repo_path="."):
+        """Pool that appends fixes to a JSONL (or .jsonl.gz) file"""
+        return cls(num_agents, repo_path, JsonlSink(path))
+
+    @property
+    def total_fixes(self):
+        return self.sink.count if self.sink is not None else len(self.all_fixes)
+
     def run_all(self):
-        """Run all agents"""
+        """Run all agents concurrently over one shared issue queue"""
         print(f"Starting {len(self.agents)} developer agents...")
 
-        for agent in self.agents:
-            fixes = agent.run()
-            self.all_fixes.extend(fixes)
+        queue = IssueQueue(self.agents[0].list_issues(), len(self.agents))
+        with ThreadPoolExecutor(max_workers=len(self.agents)) as executor:
+            futures = [executor.submit(agent.run, queue, i)
+                       for i, agent in enumerate(self.agents)]
+            for future in futures:
+                self.all_fixes.extend(future.result())
+        if self.sink is not None:
+            self.sink.flush()
+        self.agents[0].inbox.commit()
 
         return self.all_fixes
 
     def save_results(self, filename="developer_fixes.json"):
         """Save fixes to file"""
+        if self.sink is not None:
+            self.sink.close()
+            print(f"Fixes streamed to {self.sink.path}")
+            return
         try:
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(self.all_fixes, f, indent=2)
@@ -83,5 +181,5 @@ class DeveloperPool:
 
 if __name__ == "__main__":
     pool = DeveloperPool(num_agents=4)
-    fixes = pool.run_all()
-    print(f"Total fixes: {len(fixes)}")
+    pool.run_all()
+    print(f"Total fixes: {pool.total_fixes}")
@@ -6,13 +6,20 @@ Inspired by EvoAgentX architecture for autonomous code evolution
 
 import os
 import json
-import requests
+import time
+import threading
 import base64
 from datetime import datetime
 from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 
+try:
+    from .profiling import enable as enable_profiling, profiled
+except ImportError:
+    from profiling import enable as enable_profiling, profiled
+
 # ═══════════════════════════════════════════════════════════════
 # CORE: Agent Memory & State Management
 # ═══════════════════════════════════════════════════════════════
@@ -43,6 +50,102 @@ class AgentMemory:
         return self.phi_history[-n:]
 
 
+# ═══════════════════════════════════════════════════════════════
+# CORE: Deadlines & Circuit Breakers
+# ═══════════════════════════════════════════════════════════════
+
+class DeadlineExceeded(Exception):
+    """Raised when a cycle's time budget is spent before an I/O call"""
+
+
+class CircuitOpen(Exception):
+    """Raised when an endpoint's breaker rejects a call"""
+
+
+class IncompleteListing(Exception):
+    """Raised when a page after the first fails, so the listing is partial"""
+
+
+class Deadline:
+    """Absolute per-cycle time budget shared by every I/O call"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def timeout(self, cap: float) -> float:
+        """Timeout for the next call: the cap, clipped to what is left"""
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        if remaining <= 0:
+            raise DeadlineExceeded("cycle deadline exceeded")
+        return min(cap, remaining)
+
+
+class CircuitBreaker:
+    """Closed -> open after N failures -> half-open single probe -> closed"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """Process-wide breaker for an endpoint, shared by all agents"""
+    with _breakers_lock:
+        if endpoint not in _breakers:
+            _breakers[endpoint] = CircuitBreaker(endpoint)
+        return _breakers[endpoint]
+
+
 # ═══════════════════════════════════════════════════════════════
 # CORE: Base Agent Class
 # ═══════════════════════════════════════════════════════════════
@@ -56,13 +159,64 @@ class EvoAgent(ABC):
         self.memory = AgentMemory(agent_id=agent_id)
         self.github_token = os.getenv("GITHUB_TOKEN")
         self.repo = "bratovb24-cell/nexus-resonance"
+        self.github_api = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
         self.headers = {
             "Authorization": f"token {self.github_token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        self._session = None
+
+    @property
+    def session(self):
+        """Pooled HTTP session; requests is imported on first use"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def request(self, method: str, url: str, endpoint: str,
+                deadline: Optional[Deadline] = None, cap: float = 10, **kwargs):
+        """HTTP call bounded by the cycle deadline and the endpoint's breaker"""
+        breaker = get_breaker(endpoint)
+        timeout = deadline.timeout(cap) if deadline else cap
+        if not breaker.allow():
+            raise CircuitOpen(f"{endpoint} circuit open")
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        except Exception:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def get_all_pages(self, url: str, endpoint: str, deadline: Optional[Deadline] = None,
+                      **kwargs) -> Optional[List]:
+        """GET a list endpoint, following rel="next" Link headers.
+
+        Returns None when the first page fails and raises IncompleteListing
+        when a later one does, so a partial list is never taken as complete.
+        """
+        items = None
+        while url:
+            response = self.request("GET", url, endpoint, deadline, **kwargs)
+            if response.status_code != 200:
+                if items is None:
+                    return None
+                raise IncompleteListing(
+                    f"{endpoint}: page {url} returned {response.status_code} "
+                    f"after {len(items)} items")
+            if items is None:
+                items = []
+            items.extend(response.json())
+            url = response.links.get("next", {}).get("url")
+            kwargs.pop("params", None)  # the next link already carries the query
+        return items
 
     @abstractmethod
-    def perceive(self) -> Dict:
+    def perceive(self, deadline: Optional[Deadline] = None) -> Dict:
         pass
 
     @abstractmethod
@@ -73,10 +227,14 @@ class EvoAgent(ABC):
     def act(self, decision: Dict) -> Dict:
         pass
 
-    def run_cycle(self) -> Dict:
+    @profiled()
+    def run_cycle(self, deadline: Optional[Deadline] = None,
+                  perception: Optional[Dict] = None) -> Dict:
+        """Perceive-think-act; a pre-gathered (e.g. merged) perception skips perceive"""
         print(f"\n[{self.role}] Agent {self.agent_id} starting cycle...")
 
-        perception = self.perceive()
+        if perception is None:
+            perception = self.perceive(deadline)
         self.memory.observe(perception)
         print(f"  Perceived: {list(perception.keys())}")
 
@@ -96,6 +254,79 @@ class EvoAgent(ABC):
         }
 
 
+# ═══════════════════════════════════════════════════════════════
+# CORE: Incremental ai_context.json parsing
+# ═══════════════════════════════════════════════════════════════
+
+_decoder = json.JSONDecoder()
+_WS = " \t\n\r"
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WS:
+        pos += 1
+    return pos
+
+
+def _malformed(text: str, pos: int, expected: str) -> ValueError:
+    if pos >= len(text):
+        return ValueError(f"ai_context.json truncated at offset {pos}")
+    return ValueError(f"ai_context.json: expected {expected} at offset {pos}")
+
+
+def iter_agent_phi(text: str):
+    """Yield the phi of each entry in the top-level "agents" array.
+
+    Walks the document one value at a time instead of materialising the
+    whole context, so only a single agent record is alive at once and
+    every other top-level key is skipped without being kept. A truncated
+    or malformed document raises ValueError, possibly after some values
+    were yielded, so callers must consume it fully before trusting them.
+    """
+    pos = _skip_ws(text, 0)
+    if not text.startswith("{", pos):
+        raise _malformed(text, pos, "'{'")
+    pos = _skip_ws(text, pos + 1)
+    if text.startswith("}", pos):
+        return
+    while True:
+        key, pos = _decoder.raw_decode(text, pos)
+        if not isinstance(key, str):
+            raise _malformed(text, pos, "a string key")
+        pos = _skip_ws(text, pos)
+        if not text.startswith(":", pos):
+            raise _malformed(text, pos, "':'")
+        pos = _skip_ws(text, pos + 1)
+
+        if key == "agents" and text.startswith("[", pos):
+            pos = _skip_ws(text, pos + 1)
+            closed = text.startswith("]", pos)
+            if closed:
+                pos += 1
+            while not closed:
+                agent, pos = _decoder.raw_decode(text, pos)
+                if isinstance(agent, dict) and "phi" in agent:
+                    yield agent["phi"]
+                pos = _skip_ws(text, pos)
+                if text.startswith(",", pos):
+                    pos = _skip_ws(text, pos + 1)
+                elif text.startswith("]", pos):
+                    pos += 1
+                    closed = True
+                else:
+                    raise _malformed(text, pos, "',' or ']'")
+        else:
+            _, pos = _decoder.raw_decode(text, pos)
+
+        pos = _skip_ws(text, pos)
+        if text.startswith(",", pos):
+            pos = _skip_ws(text, pos + 1)
+        elif text.startswith("}", pos):
+            return
+        else:
+            raise _malformed(text, pos, "',' or '}'")
+
+
 # ═══════════════════════════════════════════════════════════════
 # ANALYZER AGENT
 # ═══════════════════════════════════════════════════════════════
@@ -103,49 +334,96 @@ class EvoAgent(ABC):
 class AnalyzerAgent(EvoAgent):
     """Analyzes phi-metric and finds problems"""
 
-    def __init__(self, agent_id: str = "analyzer-1"):
+    context_path = "/opt/bridge/io/ai_context.json"
+
+    def __init__(self, agent_id: str = "analyzer-1", repos: Optional[List[str]] = None,
+                 read_context: bool = True):
         super().__init__(agent_id, "Analyzer")
-        self.vps_api = "http://176.123.169.38:5000/vps"
+        self.vps_api = os.getenv("NEXUS_VPS_API", "http://176.123.169.38:5000/vps")
         self.vps_key = "claude2025"
+        self.read_context = read_context
+        self.repos = [self.repo] if repos is None else repos
+        self.context_fingerprint: Optional[str] = None
+        self.context_phi: Optional[float] = None
+        self.issues_open: Dict[str, int] = {}
+
+    def fetch_context_phi(self, deadline: Optional[Deadline] = None) -> Optional[float]:
+        """Max agent phi from ai_context.json, transferring it only when changed.
+
+        The bridge compares the file's mtime:size against the fingerprint of
+        the last fetch and sends the content only when it differs, so an
+        unchanged context costs a single short line.
+        """
+        path = self.context_path
+        cmd = (
+            f'fp=$(stat -c %Y:%s {path}); echo "$fp"; '
+            f'[ "$fp" = "{self.context_fingerprint or ""}" ] || cat {path}'
+        )
+        response = self.request(
+            "POST", self.vps_api, "vps", deadline,
+            json={"key": self.vps_key, "cmd": cmd}
+        )
+        if response.status_code != 200:
+            return self.context_phi
+
+        out = response.json().get("out", "")
+        fingerprint, _, body = out.partition("\n")
+        fingerprint = fingerprint.strip()
+        if not fingerprint or fingerprint == self.context_fingerprint:
+            return self.context_phi
 
-    def perceive(self) -> Dict:
+        try:
+            phi_values = list(iter_agent_phi(body))
+        except ValueError as e:
+            # keep the old fingerprint so the bridge sends the file again
+            print(f"  ai_context.json unreadable: {e}")
+            return self.context_phi
+        self.context_phi = max(phi_values) if phi_values else 0.18
+        self.context_fingerprint = fingerprint
+        return self.context_phi
+
+    def perceive(self, deadline: Optional[Deadline] = None) -> Dict:
         perception = {
             "phi_current": 0.18,
             "phi_threshold": 0.75,
             "system_status": "stable",
-            "issues_open": 0
+            "issues_open": sum(self.issues_open.values())
         }
+        if self.context_phi is not None:
+            perception["phi_current"] = self.context_phi
+
+        if self.read_context:
+            try:
+                phi = self.fetch_context_phi(deadline)
+                if phi is not None:
+                    perception["phi_current"] = phi
+            except Exception as e:
+                print(f"  VPS connection: {e}")
+
+        for repo in self.repos:
+            try:
+                url = f"{self.github_api}/repos/{repo}/issues"
+                issues = self.get_all_pages(url, "github", deadline, headers=self.headers,
+                                            params={"state": "open", "per_page": 100})
+                if issues is not None:
+                    self.issues_open[repo] = len(issues)
+            except Exception as e:
+                print(f"  GitHub connection: {e}")
+        perception["issues_open"] = sum(self.issues_open.values())
 
-        try:
-            response = requests.post(
-                self.vps_api,
-                json={"key": self.vps_key, "cmd": "cat /opt/bridge/io/ai_context.json"},
-                timeout=10
-            )
-            if response.status_code == 200:
-                data = response.json()
-                context = json.loads(data.get("out", "{}"))
-                agents = context.get("agents", [])
-                if agents:
-                    phi_values = [a.get("phi", 0.18) for a in agents if "phi" in a]
-                    perception["phi_current"] = max(phi_values) if phi_values else 0.18
-        except Exception as e:
-            print(f"  VPS connection: {e}")
-
-        try:
-            url = f"https://api.github.com/repos/{self.repo}/issues?state=open"
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                perception["issues_open"] = len(response.json())
-        except:
-            pass
-
-        self.memory.phi_history.append(perception["phi_current"])
         return perception
 
+    @staticmethod
+    def merge_perceptions(perceptions: List[Dict]) -> Dict:
+        """Combine shard perceptions: the lead's phi, total open issues"""
+        merged = dict(perceptions[0])
+        merged["issues_open"] = sum(p["issues_open"] for p in perceptions)
+        return merged
+
     def think(self, perception: Dict) -> Dict:
         problems = []
         phi = perception["phi_current"]
+        self.memory.phi_history.append(phi)
 
         if phi > 0.5:
             problems.append({
@@ -184,22 +462,33 @@ class AnalyzerAgent(EvoAgent):
 class DeveloperAgent(EvoAgent):
     """Creates fixes for problems"""
 
-    def __init__(self, agent_id: str = "developer-1"):
+    def __init__(self, agent_id: str = "developer-1", repos: Optional[List[str]] = None):
         super().__init__(agent_id, "Developer")
-
-    def perceive(self) -> Dict:
-        perception = {"pending_issues": [], "open_prs": 0}
-
-        try:
-            url = f"https://api.github.com/repos/{self.repo}/issues"
-            params = {"labels": "auto-fix", "state": "open"}
-            response = requests.get(url, headers=self.headers, params=params)
-            if response.status_code == 200:
-                perception["pending_issues"] = response.json()
-        except:
-            pass
-
-        return perception
+        self.repos = [self.repo] if repos is None else repos
+        self.pending_issues: Dict[str, List[Dict]] = {}
+
+    def perceive(self, deadline: Optional[Deadline] = None) -> Dict:
+        params = {"labels": "auto-fix", "state": "open", "per_page": 100}
+        for repo in self.repos:
+            try:
+                url = f"{self.github_api}/repos/{repo}/issues"
+                issues = self.get_all_pages(url, "github", deadline,
+                                            headers=self.headers, params=params)
+                if issues is not None:
+                    self.pending_issues[repo] = issues
+            except Exception as e:
+                print(f"  GitHub connection: {e}")
+
+        pending = [issue for issues in self.pending_issues.values() for issue in issues]
+        return {"pending_issues": pending, "open_prs": 0}
+
+    @staticmethod
+    def merge_perceptions(perceptions: List[Dict]) -> Dict:
+        """Combine shard perceptions: all pending issues across repositories"""
+        return {
+            "pending_issues": [i for p in perceptions for i in p["pending_issues"]],
+            "open_prs": sum(p["open_prs"] for p in perceptions)
+        }
 
     def think(self, perception: Dict) -> Dict:
         issues = perception["pending_issues"]
@@ -226,15 +515,68 @@ class DeveloperAgent(EvoAgent):
 # ═══════════════════════════════════════════════════════════════
 
 class EvolutionPipeline:
-    """Orchestrates the evolution cycle"""
-
-    def __init__(self):
-        self.analyzer = AnalyzerAgent()
-        self.developer = DeveloperAgent()
+    """Orchestrates the evolution cycle
+
+    Each role may run several agents, which split the repositories
+    round-robin. ai_context.json is fetched and parsed once per cycle, by
+    the first analyzer only: parsing is CPU-bound, so splitting it across
+    threads would only multiply the transfer. Shards perceive concurrently
+    on a thread pool that lives until close(), then the first agent of the
+    role thinks and acts on the merged perception so the cycle has one
+    summary.
+    """
+
+    def __init__(self, cycle_budget: Optional[float] = 30.0, num_analyzers: int = 1,
+                 num_developers: int = 1, repos: Optional[List[str]] = None):
+        if num_analyzers < 1 or num_developers < 1:
+            raise ValueError("num_analyzers and num_developers must be at least 1")
+        repos = repos or ["bratovb24-cell/nexus-resonance"]
+        self.analyzers = [
+            AnalyzerAgent(f"analyzer-{i + 1}", repos[i::num_analyzers], read_context=(i == 0))
+            for i in range(num_analyzers)
+        ]
+        self.developers = [
+            DeveloperAgent(f"developer-{i + 1}", repos[i::num_developers])
+            for i in range(num_developers)
+        ]
+        self.analyzer = self.analyzers[0]
+        self.developer = self.developers[0]
+        self.cycle_budget = cycle_budget
         self.cycle_count = 0
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(num_analyzers, num_developers),
+            thread_name_prefix="nexus-shard"
+        )
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run_role(self, agents: List[EvoAgent], deadline: Optional[Deadline]) -> Dict:
+        if len(agents) == 1:
+            return agents[0].run_cycle(deadline)
+
+        perceptions = list(self._pool.map(lambda agent: agent.perceive(deadline), agents))
+        lead = agents[0]
+        result = lead.run_cycle(deadline, perception=lead.merge_perceptions(perceptions))
+        result["shards"] = [agent.agent_id for agent in agents]
+        return result
+
+    def run_analysis(self, deadline: Optional[Deadline] = None) -> Dict:
+        return self._run_role(self.analyzers, deadline)
+
+    def run_development(self, deadline: Optional[Deadline] = None) -> Dict:
+        return self._run_role(self.developers, deadline)
 
+    @profiled()
     def run_evolution_cycle(self) -> Dict:
         self.cycle_count += 1
+        deadline = Deadline(self.cycle_budget)
         print(f"\n{'='*60}")
         print(f"EVOLUTION CYCLE #{self.cycle_count}")
         print(f"{'='*60}")
@@ -248,13 +590,13 @@ class EvolutionPipeline:
         # Stage 1: Analysis
         print("\n[STAGE 1] ANALYSIS")
         print("-" * 40)
-        analyzer_result = self.analyzer.run_cycle()
+        analyzer_result = self.run_analysis(deadline)
         results["stages"]["analyzer"] = analyzer_result
 
         # Stage 2: Development
         print("\n[STAGE 2] DEVELOPMENT")
         print("-" * 40)
-        developer_result = self.developer.run_cycle()
+        developer_result = self.run_development(deadline)
         results["stages"]["developer"] = developer_result
 
         # Summary
@@ -270,12 +612,15 @@ class EvolutionPipeline:
 
 
 def main():
-    """Run evolution cycle"""
+    """Run evolution cycle (--profile: cProfile it into .nexus_cache/profiles)"""
+    import sys
+    if "--profile" in sys.argv[1:]:
+        enable_profiling()
     print("NEXUS EvoAgentX Core v3.1")
     print("=" * 60)
 
-    pipeline = EvolutionPipeline()
-    result = pipeline.run_evolution_cycle()
+    with EvolutionPipeline() as pipeline:
+        result = pipeline.run_evolution_cycle()
 
     print(f"\nEvolution cycle completed successfully!")
     return result
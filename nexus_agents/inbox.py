@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NEXUS Issue Inbox - incremental view of .github/issues
+Scans with os.scandir and remembers (name, mtime, inode) of every entry in a
+persisted cursor, so each poll returns only new or changed issues.
+"""
+
+import os
+import json
+import time
+import select
+import sys
+
+
+class IssueInbox:
+    """Incremental issue-directory scanner with an optional inotify watch"""
+
+    def __init__(self, issues_dir, cursor_file=None):
+        self.issues_dir = issues_dir
+        self.cursor_file = cursor_file
+        self._cursor = None
+        self._staged = None
+        self._inotify = None
+
+    def _load_cursor(self):
+        if self._cursor is None:
+            self._cursor = {}
+            try:
+                if self.cursor_file and os.path.exists(self.cursor_file):
+                    with open(self.cursor_file, 'r', encoding='utf-8') as f:
+                        self._cursor = json.load(f).get("entries", {})
+            except Exception as e:
+                print(f"Inbox cursor unreadable, rescanning: {e}")
+        return self._cursor
+
+    def poll(self, commit=True):
+        """New or changed issues since the last committed poll
+
+        Returns dicts with name, path, mtime_ns, inode and size. With
+        commit=False the new cursor is only staged until commit() is called,
+        so a crash before the issues are handled replays them next time.
+        """
+        seen, changed = self._scan()
+        self._staged = seen
+        if commit:
+            self.commit()
+        return changed
+
+    def peek(self):
+        """Like poll(), but stages nothing: the cursor is left untouched"""
+        return self._scan()[1]
+
+    def count(self):
+        """Number of issue files present, new or not; no stat, no cursor"""
+        try:
+            with os.scandir(self.issues_dir) as entries:
+                return sum(1 for entry in entries if entry.is_file())
+        except FileNotFoundError:
+            return 0
+
+    def _scan(self):
+        cursor = self._load_cursor()
+        seen = {}
+        changed = []
+        try:
+            with os.scandir(self.issues_dir) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    state = [st.st_mtime_ns, st.st_ino]
+                    seen[entry.name] = state
+                    if cursor.get(entry.name) != state:
+                        changed.append({"name": entry.name, "path": entry.path,
+                                        "mtime_ns": st.st_mtime_ns, "inode": st.st_ino,
+                                        "size": st.st_size})
+        except FileNotFoundError:
+            pass
+
+        changed.sort(key=lambda e: e["name"])
+        return seen, changed
+
+    def commit(self):
+        """Persist the cursor staged by the last poll"""
+        if self._staged is None:
+            return
+        staged, self._staged = self._staged, None
+        if staged == self._cursor:
+            return
+        self._cursor = staged
+        if not self.cursor_file:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cursor_file)), exist_ok=True)
+        tmp = self.cursor_file + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"entries": staged}, f, separators=(",", ":"))
+        os.replace(tmp, self.cursor_file)
+
+    def watch(self, timeout=None, interval=1.0):
+        """Block until the inbox changes (or timeout), then return the changes
+
+        Uses inotify on Linux so an idle inbox costs no scans; elsewhere it
+        falls back to polling every `interval` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changes = self.poll()
+        while not changes:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            fd = self._inotify_fd()
+            if fd is not None:
+                ready, _, _ = select.select([fd], [], [], remaining)
+                if ready:
+                    self._drain(fd)
+            else:
+                time.sleep(interval if remaining is None else min(interval, remaining))
+            changes = self.poll()
+        return changes
+
+    def _inotify_fd(self):
+        if self._inotify is not None:
+            return self._inotify if self._inotify >= 0 else None
+        self._inotify = -1
+        if not sys.platform.startswith("linux") or not os.path.isdir(self.issues_dir):
+            return None
+        try:
+            import ctypes
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            # IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+            # | IN_CREATE | IN_DELETE
+            mask = 0x002 | 0x004 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+            if libc.inotify_add_watch(fd, os.fsencode(self.issues_dir), mask) < 0:
+                os.close(fd)
+                return None
+            self._inotify = fd
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    @staticmethod
+    def _drain(fd):
+        try:
+            while os.read(fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        if self._inotify is not None and self._inotify >= 0:
+            os.close(self._inotify)
+        self._inotify = None
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NEXUS Metrics Store - concurrency-safe read-modify-write of metrics.json
+
+Writers read the file without locking, apply their change to a copy and
+then commit it with a compare-and-swap on the "revision" field: a short
+lock on a sidecar `.lock` file covers only the re-read, the revision check
+and an atomic os.replace, never the caller's work. A writer that loses the
+race re-applies its change to the fresh data, so concurrent processes do
+not lose each other's updates. Readers never lock; they always see a
+complete file.
+"""
+
+import os
+import json
+import time
+import random
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to an O_EXCL lock file
+    fcntl = None
+
+REVISION_KEY = "revision"
+
+
+class MetricsConflict(Exception):
+    """Raised when the revision changed between read and commit"""
+
+
+class MetricsStore:
+    """JSON document updated with optimistic compare-and-swap"""
+
+    def __init__(self, path, default=None, retries=8, lock_timeout=10.0,
+                 indent=2, ensure_ascii=True):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.default = default or {}
+        self.retries = retries
+        self.lock_timeout = lock_timeout
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+
+    def read(self):
+        """Current document, or a copy of the default if missing or unreadable"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+        except (OSError, ValueError):
+            pass
+        return json.loads(json.dumps(self.default))
+
+    def update(self, mutate):
+        """Apply mutate(data) -> new data and commit it; returns what was written
+
+        mutate receives a private copy and may modify it in place and
+        return None. It may be called more than once when other writers
+        commit first, so it must derive its result from the data it is
+        given (e.g. add a delta) rather than from an earlier read. After
+        `retries` lost races the final attempt runs under the lock, which
+        guarantees progress under heavy contention.
+        """
+        for attempt in range(self.retries):
+            data = self.read()
+            revision = data.get(REVISION_KEY, 0)
+            new = self._apply(mutate, data)
+            try:
+                return self.compare_and_swap(revision, new)
+            except MetricsConflict:
+                time.sleep(random.uniform(0, 0.002 * 2 ** attempt))
+
+        with self._locked():
+            data = self.read()
+            new = self._apply(mutate, data)
+            new[REVISION_KEY] = data.get(REVISION_KEY, 0) + 1
+            self._write(new)
+            return new
+
+    def compare_and_swap(self, revision, data):
+        """Write data if the stored revision is still `revision`"""
+        with self._locked():
+            current = self.read().get(REVISION_KEY, 0)
+            if current != revision:
+                raise MetricsConflict(f"{self.path}: revision {revision} is now {current}")
+            data[REVISION_KEY] = revision + 1
+            self._write(data)
+            return data
+
+    @staticmethod
+    def _apply(mutate, data):
+        result = mutate(data)
+        return data if result is None else result
+
+    def _write(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix=".metrics-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=self.indent, ensure_ascii=self.ensure_ascii)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _locked(self):
+        if fcntl is not None:
+            return _FlockLock(self.lock_path)
+        return _ExclusiveFileLock(self.lock_path, self.lock_timeout)
+
+
+class _FlockLock:
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+
+
+class _ExclusiveFileLock:
+    """Lock file created with O_EXCL; a lock older than `timeout` is stale"""
+
+    def __init__(self, path, timeout):
+        self.path = path
+        self.timeout = timeout
+
+    def __enter__(self):
+        while True:
+            try:
+                os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.stat(self.path).st_mtime > self.timeout:
+                        os.unlink(self.path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(random.uniform(0.001, 0.005))
+
+    def __exit__(self, *exc):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
@@ -1,7 +1,26 @@
-from .tester_agent import TesterAgent
-from .optimizer_agent import OptimizerAgent
-from .extended_evolution_loop import ExtendedEvolutionLoop
-from .resonant_analyzer import ResonantAnalyzerAgent, ResonatorTools, Perspective
+import importlib
+
+_LAZY = {
+    'TesterAgent': '.tester_agent',
+    'OptimizerAgent': '.optimizer_agent',
+    'ExtendedEvolutionLoop': '.extended_evolution_loop',
+    'ResonantAnalyzerAgent': '.resonant_analyzer',
+    'ResonatorTools': '.resonant_analyzer',
+    'Perspective': '.resonant_analyzer',
+    'AnalysisService': '.analysis_service',
+}
 
 __all__ = ['TesterAgent', 'OptimizerAgent', 'ExtendedEvolutionLoop', 
-           'ResonantAnalyzerAgent', 'ResonatorTools', 'Perspective']
+           'ResonantAnalyzerAgent', 'ResonatorTools', 'Perspective', 'AnalysisService']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
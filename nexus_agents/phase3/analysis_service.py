@@ -0,0 +1,341 @@
+"""
+AnalysisService - resident analyzer answering requests over a Unix socket
+
+The service keeps each file's source, syntax check and per-perspective
+findings in memory, keyed by (size, mtime_ns), and only re-reads files
+whose key changed; findings are computed from the cached source. A
+background thread re-lists the project every few seconds; each request
+also re-stats the files it touches, so answers are never stale.
+
+Protocol: one JSON object per line, e.g. {"op": "analyze"}, answered with
+{"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+
+Run:
+  python -m nexus_agents.phase3.analysis_service serve
+  python -m nexus_agents.phase3.analysis_service analyze [files...]
+  python -m nexus_agents.phase3.analysis_service validate [files...]
+  python -m nexus_agents.phase3.analysis_service search PATTERN
+  python -m nexus_agents.phase3.analysis_service status | stop
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import socketserver
+import sys
+import threading
+import time
+from datetime import datetime
+
+from ..state import state_path
+
+SOCKET_NAME = "analysis.sock"
+REFRESH_INTERVAL = 2.0
+SEARCH_LIMIT = 50
+
+
+def socket_path(project_root="."):
+    return state_path(project_root, SOCKET_NAME)
+
+
+class _FileEntry:
+    __slots__ = ("key", "source", "decoded", "syntax_error", "findings")
+
+    def __init__(self, key, source, decoded, syntax_error):
+        self.key = key
+        self.source = source
+        self.decoded = decoded  # valid UTF-8, as the analyzer reads it
+        self.syntax_error = syntax_error
+        self.findings = {}
+
+
+class AnalysisService:
+    def __init__(self, project_root=".", refresh_interval=REFRESH_INTERVAL):
+        from .resonant_analyzer import ResonantAnalyzerAgent, Perspective
+        self.project_root = project_root
+        self.refresh_interval = refresh_interval
+        self.agent = ResonantAnalyzerAgent(project_root)
+        self.evolution = Perspective.EVOLUTION
+        self.syntax = Perspective.SYNTAX
+        self.files = []
+        self.entries = {}
+        self.version = 0
+        self.requests = 0
+        self.started = time.time()
+        self._analysis = None  # (version, result) of the last full analysis
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self.refresh()
+
+    # --- state -------------------------------------------------------------
+
+    def refresh(self):
+        """Re-list the project and drop entries for files that are gone"""
+        files = self.agent.tools.find_python_files()
+        with self._lock:
+            if files != self.files:
+                self.files = files
+                self.version += 1
+            listed = set(files)
+            for path in [p for p in self.entries if p not in listed]:
+                del self.entries[path]
+            self._check(files)
+
+    def _check(self, files):
+        """Reload every file whose (size, mtime) changed; returns live paths"""
+        live = []
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                if self.entries.pop(path, None) is not None:
+                    self.version += 1
+                continue
+            key = (st.st_size, st.st_mtime_ns)
+            entry = self.entries.get(path)
+            if entry is None or entry.key != key:
+                self.entries[path] = self._load(path, key)
+                self.version += 1
+            live.append(path)
+        return live
+
+    @staticmethod
+    def _load(path, key):
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            return _FileEntry(key, "", False, {"error": str(e), "line": None})
+        try:
+            source, decoded = raw.decode("utf-8"), True
+        except UnicodeDecodeError:
+            source, decoded = raw.decode("utf-8", errors="replace"), False
+        try:
+            # compiled, not just parsed, so `return` outside a function fails
+            # here exactly as it does in TesterAgent.validate_syntax
+            compile(raw, path, "exec", dont_inherit=True)
+            return _FileEntry(key, source, decoded, None)
+        except (SyntaxError, ValueError) as e:
+            return _FileEntry(key, source, decoded,
+                              {"error": str(e), "line": getattr(e, "lineno", None)})
+
+    def _findings(self, path, perspective):
+        entry = self.entries[path]
+        found = entry.findings.get(perspective)
+        if found is None:
+            if not entry.decoded:
+                found = []  # the analyzer finds nothing in unreadable files either
+            elif perspective == self.syntax and entry.syntax_error is None:
+                found = []
+            else:
+                found = self.agent.content_findings(perspective, path, entry.source)
+            entry.findings[perspective] = found
+        return found
+
+    def _resolve(self, files):
+        if not files:
+            return list(self.files)
+        prefix = os.path.join(self.project_root, "")
+        return [f if os.path.isabs(f) or f.startswith(prefix)
+                else os.path.join(self.project_root, f) for f in files]
+
+    # --- requests ----------------------------------------------------------
+
+    def analyze(self, files=None):
+        """Same summary as ResonantAnalyzerAgent.run_full_analysis, from warm state"""
+        with self._lock:
+            paths = self._check(self._resolve(files))
+            if not files and self._analysis and self._analysis[0] == self.version:
+                return dict(self._analysis[1], timestamp=datetime.now().isoformat())
+            signals = []
+            for perspective in self.agent.perspectives:
+                if perspective == self.evolution:
+                    signals.append(self.agent.analyze_from_perspective(perspective, paths))
+                    continue
+                findings = [f for path in paths for f in self._findings(path, perspective)]
+                signals.append(self.agent.make_signal(perspective, findings))
+            result = self.agent.resonate(signals)
+            summary = {
+                "files_analyzed": len(paths),
+                "perspectives_used": len(self.agent.perspectives),
+                "resonance_strength": result.resonance_strength,
+                "consensus_issues": len(result.consensus_issues),
+                "phi_delta": result.total_phi_delta,
+                "top_issues": [issue.to_dict() for issue in result.consensus_issues[:10]],
+                "timestamp": datetime.now().isoformat()
+            }
+            if not files:
+                self._analysis = (self.version, summary)
+            return summary
+
+    def validate(self, files=None):
+        """Syntax check in TesterAgent.validate_syntax's result format"""
+        with self._lock:
+            paths = self._check(self._resolve(files))
+            results = []
+            for path in paths:
+                error = self.entries[path].syntax_error
+                if error is None:
+                    results.append({"file": path, "status": "PASS", "cached": True})
+                else:
+                    results.append({"file": path, "status": "FAIL", "error": error["error"],
+                                    "line": error["line"]})
+        return {"test": "syntax", "results": results, "files": len(results),
+                "status": "PASS" if all(r["status"] == "PASS" for r in results) else "FAIL"}
+
+    def search(self, pattern, files=None, limit=SEARCH_LIMIT):
+        """Regex search over the cached sources, like ResonatorTools.search_code"""
+        regex = re.compile(pattern)
+        matches = []
+        with self._lock:
+            paths = self._check(self._resolve(files))
+            for path in paths:
+                source = self.entries[path].source
+                if not regex.search(source):
+                    continue
+                for number, line in enumerate(source.splitlines(), 1):
+                    if regex.search(line):
+                        matches.append({"file": path, "line": number, "content": line})
+                        if len(matches) >= limit:
+                            return matches
+        return matches
+
+    def status(self):
+        with self._lock:
+            return {"project_root": os.path.abspath(self.project_root),
+                    "files": len(self.files), "cached": len(self.entries),
+                    "version": self.version, "requests": self.requests,
+                    "uptime_s": round(time.time() - self.started, 1)}
+
+    def handle(self, request):
+        op = request.get("op")
+        with self._lock:
+            self.requests += 1
+        if op == "analyze":
+            return self.analyze(request.get("files"))
+        if op == "validate":
+            return self.validate(request.get("files"))
+        if op == "search":
+            return self.search(request["pattern"], request.get("files"),
+                               request.get("limit", SEARCH_LIMIT))
+        if op == "status":
+            return self.status()
+        raise ValueError(f"unknown op: {op!r}")
+
+    # --- serving -----------------------------------------------------------
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"  ⚠️  refresh failed: {e}")
+
+    def serve(self, path=None):
+        path = path or socket_path(self.project_root)
+        if os.path.exists(path):
+            if _alive(path):
+                raise RuntimeError(f"service already running on {path}")
+            os.unlink(path)
+        service = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                        if request.get("op") == "stop":
+                            self._reply({"ok": True, "result": "stopping"})
+                            threading.Thread(target=server.shutdown, daemon=True).start()
+                            return
+                        reply = {"ok": True, "result": service.handle(request)}
+                    except Exception as e:
+                        reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                    self._reply(reply)
+
+            def _reply(self, reply):
+                self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        server = socketserver.ThreadingUnixStreamServer(path, Handler)
+        server.daemon_threads = True
+        threading.Thread(target=self._refresh_loop, daemon=True).start()
+        print(f"Analysis service: {len(self.files)} files warm, listening on {path}")
+        try:
+            server.serve_forever()
+        finally:
+            self._stop.set()
+            server.server_close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def _alive(path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def request(op, project_root=".", timeout=60.0, **args):
+    """Send one request to the running service and return its result"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path(project_root))
+        sock.sendall(json.dumps(dict(args, op=op)).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            reply = json.loads(f.readline())
+    if not reply.get("ok"):
+        raise RuntimeError(reply.get("error"))
+    return reply["result"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm NEXUS analysis service")
+    parser.add_argument("--root", default=".", help="project root")
+    sub = parser.add_subparsers(dest="op", required=True)
+    serve = sub.add_parser("serve")
+    serve.add_argument("--refresh", type=float, default=REFRESH_INTERVAL)
+    for op in ("analyze", "validate"):
+        sub.add_parser(op).add_argument("files", nargs="*")
+    search = sub.add_parser("search")
+    search.add_argument("pattern")
+    search.add_argument("files", nargs="*")
+    search.add_argument("--limit", type=int, default=SEARCH_LIMIT)
+    sub.add_parser("status")
+    sub.add_parser("stop")
+    args = parser.parse_args(argv)
+
+    if args.op == "serve":
+        AnalysisService(args.root, args.refresh).serve()
+        return 0
+
+    params = {}
+    if args.op in ("analyze", "validate", "search"):
+        params["files"] = args.files or None
+    if args.op == "search":
+        params.update(pattern=args.pattern, limit=args.limit)
+    try:
+        result = request(args.op, args.root, **params)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No analysis service for {args.root}; start one with: "
+              f"python -m nexus_agents.phase3.analysis_service --root {args.root} serve",
+              file=sys.stderr)
+        return 2
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.op == "validate" and result["status"] != "PASS":
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Command runner - many subprocesses at once with bounded output
+
+Commands run concurrently on an asyncio loop under a semaphore. Stdout is
+read line by line and kept only up to a byte (or line) cap; past the cap
+the process is killed instead of being buffered. Each command has its own
+timeout, and results come back in the order the commands were given.
+"""
+import asyncio
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+DEFAULT_CONCURRENCY = 8
+MAX_OUTPUT_BYTES = 8 * 1024 * 1024
+MAX_STDERR_BYTES = 64 * 1024
+KILL_GRACE = 1.0
+# own process group, so a kill also reaches children of a shell command
+_SESSION = {"start_new_session": True} if os.name == "posix" else {}
+
+
+class CommandResult(NamedTuple):
+    cmd: object
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    truncated: bool = False
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+
+async def _read_capped(stream, lines, max_bytes, max_lines=None, on_line=None):
+    """Append lines until EOF or a cap; True if a cap was hit"""
+    size = 0
+    while True:
+        try:
+            line = await stream.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            return True  # a single line longer than the cap
+        if not line:
+            return False
+        size += len(line)
+        if size > max_bytes:
+            return True
+        lines.append(line)
+        if on_line is not None:
+            on_line(line.decode("utf-8", errors="replace"))
+        if max_lines is not None and len(lines) >= max_lines:
+            return True
+
+
+async def _drain(stream, max_bytes):
+    data = bytearray()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return bytes(data)
+        if len(data) < max_bytes:
+            data += chunk[:max_bytes - len(data)]
+
+
+async def _run_one(semaphore, cmd, cwd, timeout, max_bytes, max_lines, on_line):
+    async with semaphore:
+        started = time.perf_counter()
+        limit = max(max_bytes + 1, 65536)
+        try:
+            if isinstance(cmd, str):
+                proc = await asyncio.create_subprocess_shell(
+                    cmd, cwd=cwd, limit=limit, stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, **_SESSION)
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, cwd=cwd, limit=limit, stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, **_SESSION)
+        except OSError as e:
+            return CommandResult(cmd, None, "", str(e), elapsed=time.perf_counter() - started)
+
+        lines = []
+        stdout_task = asyncio.ensure_future(
+            _read_capped(proc.stdout, lines, max_bytes, max_lines, on_line))
+        stderr_task = asyncio.ensure_future(_drain(proc.stderr, MAX_STDERR_BYTES))
+        timed_out = truncated = False
+        try:
+            truncated = await asyncio.wait_for(asyncio.shield(stdout_task), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+        if timed_out or truncated:
+            _kill(proc)
+            # keep reading what was written before the kill, then discard the
+            # rest: the pipes must reach EOF before the process can be reaped
+            truncated = await _settle(stdout_task) or truncated
+            await _settle(asyncio.ensure_future(_drain(proc.stdout, 0)))
+        stderr = await _settle(stderr_task) or b""
+        returncode = await proc.wait()
+
+        return CommandResult(
+            cmd, None if timed_out else returncode,
+            b"".join(lines).decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+            truncated, timed_out, time.perf_counter() - started)
+
+
+async def _settle(task):
+    """Result of a task, giving it KILL_GRACE seconds before cancelling"""
+    try:
+        return await asyncio.wait_for(task, KILL_GRACE)
+    except asyncio.TimeoutError:
+        return None
+
+
+def _kill(proc):
+    try:
+        if _SESSION:
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_commands(commands, cwd=None, concurrency=DEFAULT_CONCURRENCY, timeout=30,
+                       max_bytes=MAX_OUTPUT_BYTES, max_lines=None, on_line=None):
+    """Run commands (argv lists, or strings for the shell) concurrently"""
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(
+        _run_one(semaphore, cmd, cwd, timeout, max_bytes, max_lines, on_line)
+        for cmd in commands))
+
+
+def run_many(commands, **options):
+    """Blocking wrapper around run_commands; safe to call from inside a loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_commands(commands, **options))
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, run_commands(commands, **options)).result()
@@ -1,27 +1,36 @@
 """
 ExtendedEvolutionLoop - Integrates all agents into single evolution cycle
 """
-import json
 import os
 import time
 from datetime import datetime
 
+from ..metrics_store import MetricsStore
+from ..profiling import profiled
+from ..state import state_path
+from .stage_cache import StageCache, fingerprint
+
 class ExtendedEvolutionLoop:
-    def __init__(self, project_root="."):
+    def __init__(self, project_root=".", use_stage_cache=True, import_time=False):
         self.project_root = project_root
+        self.import_time = import_time  # gate cycles on cold import regressions
         self.metrics_file = os.path.join(project_root, "metrics.json")
+        self.metrics_store = MetricsStore(self.metrics_file, default={
+            "phi": 0.18, "cycle": 0, "status": "init", "history": []})
         self.cycle = 0
+        self.stage_cache = (StageCache(state_path(project_root, "stage_cache.json", create=False))
+                            if use_stage_cache else None)
 
     def load_metrics(self):
-        try:
-            with open(self.metrics_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {"phi": 0.18, "cycle": 0, "status": "init", "history": []}
+        return self.metrics_store.read()
 
     def save_metrics(self, metrics):
-        with open(self.metrics_file, 'w') as f:
-            json.dump(metrics, f, indent=2)
+        """Replace metrics wholesale; prefer update_metrics for read-modify-write"""
+        return self.metrics_store.update(lambda current: dict(metrics))
+
+    def update_metrics(self, mutate):
+        """Apply mutate to the latest metrics, safe against concurrent loops"""
+        return self.metrics_store.update(mutate)
 
     def run_analyzer(self):
         """Simulate analyzer finding issues"""
@@ -35,13 +44,16 @@ class ExtendedEvolutionLoop:
         """Run TesterAgent"""
         from .tester_agent import TesterAgent
         tester = TesterAgent(self.project_root)
-        return tester.run()
+        return tester.run(stage_cache=self.stage_cache, import_time=self.import_time)
 
     def run_optimizer(self):
         """Run OptimizerAgent"""
         from .optimizer_agent import OptimizerAgent
         optimizer = OptimizerAgent(self.project_root)
-        return optimizer.generate_optimization_report()
+        if self.stage_cache is None:
+            return optimizer.generate_optimization_report()
+        return self.stage_cache.run("optimizer", fingerprint(optimizer.input_fingerprint()),
+                                    optimizer.generate_optimization_report)
 
     def calculate_phi_improvement(self, test_result, optimizer_result):
         """Calculate φ improvement based on results"""
@@ -53,9 +65,12 @@ class ExtendedEvolutionLoop:
             base += 0.005
         return round(base, 3)
 
+    @profiled()
     def run_extended_cycle(self):
         """Run one complete extended evolution cycle"""
         self.cycle += 1
+        if self.stage_cache is not None:
+            self.stage_cache.begin_cycle()
         metrics = self.load_metrics()
         phi_before = metrics.get("phi", 0.18)
 
@@ -88,22 +103,26 @@ class ExtendedEvolutionLoop:
         print(f"\n📈 Шаг 5: ОБНОВЛЕНИЕ")
         print(f"  φ: {phi_before} → {phi_after} (+{phi_delta})")
 
-        # Save updated metrics
-        metrics["phi"] = phi_after
-        metrics["cycle"] = self.cycle
-        metrics["status"] = "evolving"
-        metrics["last_update"] = datetime.now().isoformat()
-        metrics["details"] = {
+        # Save updated metrics: the delta is applied to the latest φ, so
+        # loops running in parallel do not overwrite each other's progress
+        details = {
             "completed_tasks": executor["completed"],
             "phi_delta": phi_delta,
             "tester_status": test_result.get("overall_status", "UNKNOWN"),
             "optimizer_recommendations": len(optimizer_result.get("recommendations", []))
         }
-        if "history" not in metrics:
-            metrics["history"] = []
-        metrics["history"].append({"phi": phi_after, "cycle": self.cycle})
 
-        self.save_metrics(metrics)
+        def apply(metrics):
+            metrics["phi"] = round(metrics.get("phi", 0.18) + phi_delta, 3)
+            metrics["cycle"] = self.cycle
+            metrics["status"] = "evolving"
+            metrics["last_update"] = datetime.now().isoformat()
+            metrics["details"] = details
+            metrics.setdefault("history", []).append({"phi": metrics["phi"], "cycle": self.cycle})
+
+        saved = self.update_metrics(apply)
+        phi_after = saved["phi"]
+        phi_before = round(phi_after - phi_delta, 3)
 
         return {
             "cycle": self.cycle,
@@ -111,7 +130,8 @@ class ExtendedEvolutionLoop:
             "phi_after": phi_after,
             "phi_delta": phi_delta,
             "test_status": test_result.get("overall_status"),
-            "recommendations": len(optimizer_result.get("recommendations", []))
+            "recommendations": len(optimizer_result.get("recommendations", [])),
+            "stage_cache": self.stage_cache.report() if self.stage_cache is not None else None
         }
 
     def run_extended_continuous(self, max_cycles=5):
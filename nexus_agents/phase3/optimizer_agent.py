@@ -3,8 +3,28 @@ OptimizerAgent - Analyzes evolution history and generates recommendations
 """
 import json
 import os
+import math
+import time
+import random
+import sys
 from datetime import datetime
 
+try:
+    from ..profiling import enable as enable_profiling, profiled
+except ImportError:  # run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from profiling import enable as enable_profiling, profiled
+
+PHI_ALERT_THRESHOLD = 0.75
+
+def _quantile_sorted(values, q):
+    """Linear-interpolated quantile of an already sorted list (NumPy's default)"""
+    pos = (len(values) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
 class OptimizerAgent:
     def __init__(self, project_root="."):
         self.project_root = project_root
@@ -39,6 +59,108 @@ class OptimizerAgent:
         except:
             return {"trend": "ERROR", "delta": 0}
 
+    def input_fingerprint(self):
+        """The metrics fields the optimization report depends on
+
+        The trend only looks at the deltas of the last five history entries
+        and the patterns at details.completed_tasks, so a steady loop whose
+        φ keeps growing by the same step yields the same fingerprint.
+        """
+        try:
+            with open(self.metrics_file, 'r') as f:
+                metrics = json.load(f)
+        except:
+            return None
+        history = metrics.get("history", [])
+        recent = history[-5:]
+        deltas = [round(recent[i+1].get("phi",0) - recent[i].get("phi",0), 9)
+                  for i in range(len(recent)-1)]
+        return [len(history) >= 2, deltas,
+                metrics.get("details", {}).get("completed_tasks", 0)]
+
+    def load_phi_history(self):
+        """φ values from metrics.json history, oldest first"""
+        try:
+            with open(self.metrics_file, 'r') as f:
+                metrics = json.load(f)
+            return [float(h["phi"]) for h in metrics.get("history", []) if "phi" in h]
+        except:
+            return []
+
+    def forecast_phi(self, horizon=10, paths=100_000, threshold=PHI_ALERT_THRESHOLD,
+                     quantiles=(0.05, 0.25, 0.5, 0.75, 0.95), seed=None):
+        """Monte Carlo forecast of φ over the next `horizon` cycles
+
+        Steps are drawn from a normal distribution fitted to the historical
+        per-cycle deltas. Returns per-cycle quantiles of φ and the probability
+        of reaching `threshold` (the level AnalyzerAgent alerts on) within the
+        horizon. Vectorized with NumPy when installed, pure Python otherwise.
+        """
+        started = time.perf_counter()
+        history = self.load_phi_history()
+        if len(history) < 2:
+            return {"status": "INSUFFICIENT_DATA", "history": len(history)}
+
+        deltas = [b - a for a, b in zip(history, history[1:])]
+        mu = sum(deltas) / len(deltas)
+        sigma = (math.sqrt(sum((d - mu) ** 2 for d in deltas) / (len(deltas) - 1))
+                 if len(deltas) > 1 else 0.0)
+        phi0 = history[-1]
+
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        if np is not None:
+            rng = np.random.default_rng(seed)
+            # one contiguous row per cycle keeps the per-cycle quantiles cache-friendly
+            steps = rng.normal(mu, sigma, size=(horizon, paths))
+            phis = np.cumsum(steps, axis=0, out=steps)
+            phis += phi0
+            table = np.quantile(phis, quantiles, axis=1)
+            crossed = np.maximum.accumulate(phis >= threshold, axis=0)
+            by_cycle = crossed.mean(axis=1)
+            quantile_paths = [[round(float(v), 4) for v in row] for row in table]
+            p_cross_by_cycle = [round(float(v), 4) for v in by_cycle]
+            backend = "numpy"
+        else:
+            rng = random.Random(seed)
+            columns = [[] for _ in range(horizon)]
+            crossed_at = [0] * horizon
+            for _ in range(paths):
+                phi, crossed = phi0, False
+                for k in range(horizon):
+                    phi += rng.gauss(mu, sigma)
+                    columns[k].append(phi)
+                    crossed = crossed or phi >= threshold
+                    crossed_at[k] += crossed
+            quantile_paths = [[] for _ in quantiles]
+            for column in columns:
+                column.sort()
+                for i, q in enumerate(quantiles):
+                    quantile_paths[i].append(round(_quantile_sorted(column, q), 4))
+            p_cross_by_cycle = [round(c / paths, 4) for c in crossed_at]
+            backend = "python"
+
+        if phi0 >= threshold:
+            p_cross_by_cycle = [1.0] * horizon
+
+        return {
+            "status": "OK",
+            "phi_last": phi0,
+            "step_mean": round(mu, 6),
+            "step_std": round(sigma, 6),
+            "horizon": horizon,
+            "paths": paths,
+            "threshold": threshold,
+            "quantiles": {f"p{int(q * 100):02d}": row for q, row in zip(quantiles, quantile_paths)},
+            "p_cross": p_cross_by_cycle[-1] if p_cross_by_cycle else 0.0,
+            "p_cross_by_cycle": p_cross_by_cycle,
+            "backend": backend,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
     def identify_successful_patterns(self):
         """Identify patterns that led to improvements"""
         patterns = []
@@ -81,6 +203,7 @@ class OptimizerAgent:
 
         return recommendations
 
+    @profiled()
     def generate_optimization_report(self):
         """Generate full optimization report"""
         print("\n📊 OptimizerAgent запущен")
@@ -106,7 +229,20 @@ class OptimizerAgent:
         }
 
 if __name__ == "__main__":
+    import argparse
+    try:
+        from ..streaming import write_report
+    except ImportError:
+        from streaming import write_report
+    parser = argparse.ArgumentParser(description="Evolution history optimizer")
+    parser.add_argument("--report", help="write the report as .jsonl[.gz] or .sarif")
+    parser.add_argument("--profile", action="store_true", help="cProfile the report")
+    args = parser.parse_args()
+    if args.profile:
+        enable_profiling()
     optimizer = OptimizerAgent()
     result = optimizer.generate_optimization_report()
-    print(json.dumps(result, indent=2))
-
+    if args.report:
+        write_report(args.report, result)
+    else:
+        print(json.dumps(result, indent=2))
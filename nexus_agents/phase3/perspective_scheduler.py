@@ -0,0 +1,142 @@
+"""
+PerspectiveScheduler - fit a multi-perspective analysis into a time budget
+
+Every run records, per perspective, how long it took per KB of source and
+how many findings it produced per KB (exponentially weighted, persisted in
+.nexus_cache/perspective_stats.json). Under a budget the work is split into
+(perspective, file batch) units and run greedily by expected findings per
+second; a unit whose estimated cost no longer fits is skipped and reported.
+"""
+import json
+import os
+import time
+
+# Used until a perspective has history: cheap enough to be tried first
+PRIOR_SECONDS_PER_KB = 1e-4
+PRIOR_FINDINGS_PER_KB = 0.01
+
+
+class PerspectiveStats:
+    def __init__(self, stats_file=None, alpha=0.3):
+        self.stats_file = stats_file
+        self.alpha = alpha
+        self.stats = self._load()
+
+    def _load(self):
+        try:
+            with open(self.stats_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save(self):
+        if not self.stats_file:
+            return
+        try:
+            tmp = self.stats_file + ".tmp"
+            with open(tmp, 'w') as f:
+                json.dump(self.stats, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.stats_file)
+        except OSError as e:
+            print(f"  ⚠️  perspective stats not saved: {e}")
+
+    def seconds_per_kb(self, name):
+        return self.stats.get(name, {}).get("seconds_per_kb", PRIOR_SECONDS_PER_KB)
+
+    def findings_per_kb(self, name):
+        return self.stats.get(name, {}).get("findings_per_kb", PRIOR_FINDINGS_PER_KB)
+
+    def findings_per_second(self, name):
+        return self.findings_per_kb(name) / max(self.seconds_per_kb(name), 1e-9)
+
+    def record(self, name, seconds, kb, findings):
+        """Fold one measurement into the moving averages"""
+        if kb <= 0:
+            return
+        entry = self.stats.get(name)
+        cost, rate = seconds / kb, findings / kb
+        if entry is None:
+            self.stats[name] = {"seconds_per_kb": cost, "findings_per_kb": rate, "runs": 1}
+            return
+        a = self.alpha
+        entry["seconds_per_kb"] = a * cost + (1 - a) * entry["seconds_per_kb"]
+        entry["findings_per_kb"] = a * rate + (1 - a) * entry["findings_per_kb"]
+        entry["runs"] = entry.get("runs", 0) + 1
+
+
+def file_sizes_kb(files):
+    sizes = {}
+    for path in files:
+        try:
+            sizes[path] = os.path.getsize(path) / 1024
+        except OSError:
+            sizes[path] = 0.0
+    return sizes
+
+
+class PerspectiveScheduler:
+    def __init__(self, stats, budget, started=None, batch_size=50, safety=1.25):
+        self.stats = stats
+        self.budget = budget
+        self.started = time.monotonic() if started is None else started
+        self.batch_size = batch_size
+        self.safety = safety
+
+    def remaining(self):
+        return self.budget - (time.monotonic() - self.started)
+
+    def schedule(self, perspectives, files, sizes):
+        """(perspective, batch, kb) units, best findings-per-second first
+
+        Within a perspective, recently modified files come first so a
+        trimmed run still covers what a pre-merge change touched.
+        """
+        def mtime(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:
+                return 0.0
+
+        ordered_files = sorted(files, key=mtime, reverse=True)
+        batches = [ordered_files[i:i + self.batch_size]
+                   for i in range(0, len(ordered_files), self.batch_size)]
+        ordered = sorted(perspectives, key=lambda p: self.stats.findings_per_second(p.value),
+                         reverse=True)
+        return [(p, batch, sum(sizes[f] for f in batch)) for p in ordered for batch in batches]
+
+    def execute(self, units, run_unit):
+        """Run units that fit the remaining budget; returns (findings, report)
+
+        run_unit(perspective, batch) returns that batch's findings. Stats are
+        updated after every unit, so the estimates sharpen within the run.
+        """
+        findings = {}
+        covered, skipped = {}, {}
+        analyzed = set()
+        for perspective, batch, kb in units:
+            name = perspective.value
+            estimate = self.stats.seconds_per_kb(name) * kb * self.safety
+            if estimate > self.remaining():
+                entry = skipped.setdefault(name, {"files": 0, "kb": 0.0})
+                entry["files"] += len(batch)
+                entry["kb"] += kb
+                continue
+            started = time.perf_counter()
+            found = run_unit(perspective, batch)
+            self.stats.record(name, time.perf_counter() - started, kb, len(found))
+            findings.setdefault(perspective, []).extend(found)
+            covered[name] = covered.get(name, 0) + len(batch)
+            analyzed.update(batch)
+        self.stats.save()
+
+        return findings, {
+            "budget_s": self.budget,
+            "elapsed_s": round(time.monotonic() - self.started, 3),
+            "order": list(dict.fromkeys(p.value for p, _, _ in units)),
+            "files_analyzed": len(analyzed),
+            "files_covered": covered,
+            # ran on some batches but not all of them
+            "partial": sorted(set(covered) & set(skipped)),
+            "skipped": {name: {"files": e["files"], "kb": round(e["kb"], 1)}
+                        for name, e in skipped.items()},
+        }
@@ -5,14 +5,32 @@ Multiple internal perspectives for enhanced analysis quality
 """
 
 import os
+import sys
 import json
-import subprocess
 import ast
 import re
+import mmap
+import random
+import heapq
+import time
+from contextlib import contextmanager
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, NamedTuple, Optional
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntEnum
+
+try:
+    from ..profiling import enable as enable_profiling, profiled
+    from ..state import state_path
+    from ..walker import ProjectWalker
+    from .perspective_scheduler import PerspectiveScheduler, PerspectiveStats, file_sizes_kb
+except ImportError:  # run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from profiling import enable as enable_profiling, profiled
+    from state import state_path
+    from walker import ProjectWalker
+    from perspective_scheduler import PerspectiveScheduler, PerspectiveStats, file_sizes_kb
 
 class Perspective(Enum):
     SYNTAX = "syntax"
@@ -22,72 +40,177 @@ class Perspective(Enum):
     ARCHITECTURE = "architecture"
     EVOLUTION = "evolution"
 
+class Severity(IntEnum):
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+
+class FindingType(IntEnum):
+    SYNTAX_ERROR = 1
+    SILENT_EXCEPTION = 2
+    TODO_FOUND = 3
+    DANGEROUS_EVAL = 4
+    HARDCODED_PASSWORD = 5
+    HARDCODED_KEY = 6
+    SHELL_INJECTION = 7
+    INEFFICIENT_LOOP = 8
+    LARGE_FILE = 9
+    MISSING_TESTS = 10
+
+    @property
+    def label(self):
+        return self.name.lower()
+
+class Finding(NamedTuple):
+    """One finding as a plain tuple: enum-coded type/severity, interned path.
+
+    Findings stay in this form through resonance; to_dict() is only called
+    for the issues that are actually reported.
+    """
+    type: FindingType
+    file: str
+    message: str
+    severity: Severity
+    line: Optional[int] = None
+
+    def to_dict(self):
+        d = {"type": self.type.label, "file": self.file}
+        if self.line is not None:
+            d["line"] = self.line
+        d["message"] = self.message
+        d["severity"] = self.severity.name
+        return d
+
+class ConsensusIssue(NamedTuple):
+    finding: Finding
+    perspective: Perspective
+    confidence: float
+    resonance_score: float
+
+    def to_dict(self):
+        d = self.finding.to_dict()
+        d["perspective"] = self.perspective.value
+        d["confidence"] = self.confidence
+        d["resonance_score"] = self.resonance_score
+        return d
+
 @dataclass
 class ResonanceSignal:
     perspective: Perspective
     confidence: float
-    findings: List[Dict[str, Any]]
+    findings: List[Finding]
     phi_impact: float
 
 @dataclass
 class ResonanceResult:
     amplified_signals: List[ResonanceSignal]
-    consensus_issues: List[Dict[str, Any]]
+    consensus_issues: List[ConsensusIssue]
     total_phi_delta: float
     resonance_strength: float
 
+def _rules(severity, flags, *rules):
+    """Compile each rule for both str content and mmap'd bytes"""
+    return [(re.compile(pattern, flags), re.compile(pattern.encode('utf-8'), flags),
+             issue_type, desc, severity) for pattern, issue_type, desc in rules]
+
+PATTERN_RULES = {
+    Perspective.SEMANTIC: _rules(Severity.MEDIUM, 0,
+        (r'except:\s*pass', FindingType.SILENT_EXCEPTION, 'Silent exception'),
+        (r'# TODO', FindingType.TODO_FOUND, 'TODO comment'),
+        (r'eval\s*\(', FindingType.DANGEROUS_EVAL, 'Using eval()'),
+    ),
+    Perspective.SECURITY: _rules(Severity.CRITICAL, re.IGNORECASE,
+        (r'password\s*=\s*["\'\x27]', FindingType.HARDCODED_PASSWORD, 'Hardcoded password'),
+        (r'api_key\s*=\s*["\'\x27]', FindingType.HARDCODED_KEY, 'Hardcoded API key'),
+        (r'shell\s*=\s*True', FindingType.SHELL_INJECTION, 'Potential shell injection'),
+    ),
+    Perspective.PERFORMANCE: _rules(Severity.LOW, 0,
+        (r'range\s*\(\s*len\s*\(', FindingType.INEFFICIENT_LOOP, 'Inefficient range(len())'),
+    ),
+}
+
+# Size bucket edges (bytes) used to stratify the sampled pre-check
+SAMPLE_SIZE_EDGES = (4 * 1024, 32 * 1024, 256 * 1024)
+
+# Files at least this large are scanned through mmap instead of being read
+MMAP_THRESHOLD = 4 * 1024 * 1024
+LINE_COUNT_CHUNK = 1024 * 1024
+
+@contextmanager
+def open_source(filepath):
+    """Yield file content: decoded text, or a read-only mmap for large files
+
+    Rules then run over the mapped bytes directly, so a tens-of-MB module is
+    never copied into a Python string.
+    """
+    if os.path.getsize(filepath) < MMAP_THRESHOLD:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            yield f.read()
+        return
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+def count_lines(filepath):
+    """Number of lines as len(f.readlines()) would report it"""
+    if os.path.getsize(filepath) < MMAP_THRESHOLD:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return content.count('\n') + (1 if content and not content.endswith('\n') else 0)
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        lines = 0
+        for offset in range(0, size, LINE_COUNT_CHUNK):
+            lines += mm[offset:offset + LINE_COUNT_CHUNK].count(b'\n')
+        if size and mm[size - 1:size] != b'\n':
+            lines += 1
+        return lines
+
 class ResonatorTools:
     def __init__(self, project_root="."):
         self.project_root = project_root
+        self.walker = ProjectWalker(project_root)
+
+    def find_python_files(self, max_files=None):
+        return self.walker.python_files(max_files)
+
+    def run_many(self, commands, timeout=30, **options):
+        """Run commands concurrently in the project root; CommandResults in order
 
-    def find_python_files(self, max_files=50):
-        files = []
-        for root, dirs, filenames in os.walk(self.project_root):
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
-            for f in filenames:
-                if f.endswith('.py'):
-                    files.append(os.path.join(root, f))
-                    if len(files) >= max_files:
-                        return files
-        return files
+        Commands are argv lists, or strings for the shell. Output is capped
+        (see command_runner), so fanning out e.g. one blame per file is safe.
+        """
+        try:  # asyncio costs ~25 ms to import; only pay it when commands run
+            from .command_runner import run_many
+        except ImportError:
+            from command_runner import run_many
+        return run_many(commands, cwd=self.project_root, timeout=timeout, **options)
+
+    def _run(self, cmd, timeout=60, **options):
+        return self.run_many([cmd], timeout=timeout, **options)[0]
 
     def git_diff(self, base="HEAD~1"):
-        try:
-            result = subprocess.run(['git', 'diff', base, '--name-only'],
-                capture_output=True, text=True, cwd=self.project_root)
-            return result.stdout
-        except:
-            return ""
+        return self._run(['git', 'diff', base, '--name-only']).stdout
 
     def git_log(self, n=10):
-        try:
-            result = subprocess.run(['git', 'log', f'-{n}', '--oneline'],
-                capture_output=True, text=True, cwd=self.project_root)
-            return result.stdout
-        except:
-            return ""
+        return self._run(['git', 'log', f'-{n}', '--oneline']).stdout
 
     def shell_exec(self, cmd, timeout=30):
-        try:
-            result = subprocess.run(cmd, shell=True, capture_output=True, 
-                text=True, cwd=self.project_root, timeout=timeout)
-            return result.stdout + result.stderr
-        except:
+        result = self._run(cmd, timeout=timeout)
+        if result.returncode is None:  # timed out or could not start
             return ""
+        return result.stdout + result.stderr
 
-    def search_code(self, pattern):
-        try:
-            result = subprocess.run(['grep', '-rn', pattern, '--include=*.py', '.'],
-                capture_output=True, text=True, cwd=self.project_root)
-            matches = []
-            for line in result.stdout.strip().split(chr(10)):
-                if ':' in line:
-                    parts = line.split(':', 2)
-                    if len(parts) >= 3:
-                        matches.append({"file": parts[0], "line": parts[1], "content": parts[2]})
-            return matches[:50]
-        except:
-            return []
+    def search_code(self, pattern, limit=50):
+        # grep is stopped once enough matching lines have been read
+        result = self._run(['grep', '-rn', pattern, '--include=*.py', '.'], max_lines=limit)
+        matches = []
+        for line in result.stdout.strip().split(chr(10)):
+            if ':' in line:
+                parts = line.split(':', 2)
+                if len(parts) >= 3 and parts[1].isdigit():
+                    matches.append({"file": parts[0], "line": int(parts[1]), "content": parts[2]})
+        return matches[:limit]
 
 class ResonantAnalyzerAgent:
     def __init__(self, project_root="."):
@@ -95,124 +218,284 @@ class ResonantAnalyzerAgent:
         self.perspectives = list(Perspective)
         self.tools = ResonatorTools(project_root)
 
-    def analyze_from_perspective(self, perspective, files):
+    def _file_findings(self, perspective, filepath):
+        """Findings of one perspective for one file"""
+        if perspective == Perspective.SYNTAX:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return self.content_findings(perspective, filepath, f.read())
+
+        if perspective in PATTERN_RULES:
+            try:
+                with open_source(filepath) as content:
+                    return self.content_findings(perspective, filepath, content)
+            except:
+                return []
+
+        if perspective == Perspective.ARCHITECTURE:
+            try:
+                return self._size_findings(filepath, count_lines(filepath))
+            except:
+                return []
+
+        return []
+
+    def content_findings(self, perspective, filepath, content):
+        """Findings of one perspective for content already in memory (text or mmap)"""
         findings = []
-        confidence = 0.8
-        phi_impact = 0.02
+        path = sys.intern(filepath)
 
         if perspective == Perspective.SYNTAX:
-            for filepath in files:
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        ast.parse(f.read())
-                except SyntaxError as e:
-                    findings.append({"type": "syntax_error", "file": filepath, 
-                        "line": e.lineno, "message": str(e), "severity": "HIGH"})
-            confidence = 0.95 if not findings else 0.7
+            try:
+                ast.parse(content)
+            except SyntaxError as e:
+                findings.append(Finding(FindingType.SYNTAX_ERROR, path,
+                    str(e), Severity.HIGH, e.lineno))
 
-        elif perspective == Perspective.SEMANTIC:
-            patterns = [
-                (r'except:\s*pass', 'silent_exception', 'Silent exception'),
-                (r'# TODO', 'todo_found', 'TODO comment'),
-                (r'eval\s*\(', 'dangerous_eval', 'Using eval()'),
-            ]
+        elif perspective in PATTERN_RULES:
+            for text_re, bytes_re, issue_type, desc, severity in PATTERN_RULES[perspective]:
+                rule = bytes_re if isinstance(content, mmap.mmap) else text_re
+                if rule.search(content):
+                    findings.append(Finding(issue_type, path, desc, severity))
+
+        elif perspective == Perspective.ARCHITECTURE:
+            lines = content.count('\n') + (1 if content and not content.endswith('\n') else 0)
+            findings.extend(self._size_findings(path, lines))
+
+        return findings
+
+    @staticmethod
+    def _size_findings(filepath, lines):
+        if lines > 500:
+            return [Finding(FindingType.LARGE_FILE, sys.intern(filepath),
+                            f"File too large ({lines} lines)", Severity.MEDIUM)]
+        return []
+
+    def analyze_from_perspective(self, perspective, files):
+        findings = []
+        if perspective == Perspective.EVOLUTION:
+            has_tests = any('test' in f.lower() for f in files)
+            if not has_tests:
+                findings.append(Finding(FindingType.MISSING_TESTS, "project",
+                    "No tests found", Severity.MEDIUM))
+        else:
             for filepath in files:
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    for pattern, issue_type, desc in patterns:
-                        if re.search(pattern, content):
-                            findings.append({"type": issue_type, "file": filepath,
-                                "message": desc, "severity": "MEDIUM"})
-                except:
-                    pass
+                findings.extend(self._file_findings(perspective, filepath))
+        return self.make_signal(perspective, findings)
 
+    def make_signal(self, perspective, findings):
+        """Confidence and φ impact of a perspective given its findings"""
+        confidence = 0.8
+        phi_impact = 0.02
+        if perspective == Perspective.SYNTAX:
+            confidence = 0.95 if not findings else 0.7
         elif perspective == Perspective.SECURITY:
-            patterns = [
-                (r'password\s*=\s*["\'\x27]', 'hardcoded_password', 'Hardcoded password'),
-                (r'api_key\s*=\s*["\'\x27]', 'hardcoded_key', 'Hardcoded API key'),
-                (r'shell\s*=\s*True', 'shell_injection', 'Potential shell injection'),
-            ]
-            for filepath in files:
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    for pattern, issue_type, desc in patterns:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            findings.append({"type": issue_type, "file": filepath,
-                                "message": desc, "severity": "CRITICAL"})
-                except:
-                    pass
             confidence = 0.85
             phi_impact = 0.04
-
         elif perspective == Perspective.PERFORMANCE:
-            for filepath in files:
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    if re.search(r'range\s*\(\s*len\s*\(', content):
-                        findings.append({"type": "inefficient_loop", "file": filepath,
-                            "message": "Inefficient range(len())", "severity": "LOW"})
-                except:
-                    pass
             confidence = 0.75
-
         elif perspective == Perspective.ARCHITECTURE:
-            for filepath in files:
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        lines = len(f.readlines())
-                    if lines > 500:
-                        findings.append({"type": "large_file", "file": filepath,
-                            "message": f"File too large ({lines} lines)", "severity": "MEDIUM"})
-                except:
-                    pass
             confidence = 0.7
-
         elif perspective == Perspective.EVOLUTION:
-            has_tests = any('test' in f.lower() for f in files)
-            if not has_tests:
-                findings.append({"type": "missing_tests", "file": "project",
-                    "message": "No tests found", "severity": "MEDIUM"})
             confidence = 0.6
 
         return ResonanceSignal(perspective=perspective, confidence=confidence,
             findings=findings, phi_impact=phi_impact if findings else phi_impact * 0.5)
 
     def resonate(self, signals):
+        # per file: parallel lists of findings and their signals (no per-finding pairs)
         file_issues = {}
         for signal in signals:
             for finding in signal.findings:
-                file_key = finding.get('file', 'unknown')
-                if file_key not in file_issues:
-                    file_issues[file_key] = []
-                file_issues[file_key].append({
-                    **finding,
-                    'perspective': signal.perspective.value,
-                    'confidence': signal.confidence
-                })
-
-        consensus_issues = []
-        for file_key, issues in file_issues.items():
-            issue_types = [i['type'] for i in issues]
-            for issue in issues:
-                score = issue['confidence']
-                similar_count = sum(1 for t in issue_types if t == issue['type'])
-                if similar_count > 1:
-                    score *= (1 + 0.2 * similar_count)
-                issue['resonance_score'] = min(score, 1.0)
-                consensus_issues.append(issue)
-
-        consensus_issues.sort(key=lambda x: x.get('resonance_score', 0), reverse=True)
+                findings, sources = file_issues.setdefault(finding.file, ([], []))
+                findings.append(finding)
+                sources.append(signal)
+
+        def scored():
+            for findings, sources in file_issues.values():
+                type_counts = Counter(finding.type for finding in findings)
+                for finding, signal in zip(findings, sources):
+                    score = signal.confidence
+                    similar_count = type_counts[finding.type]
+                    if similar_count > 1:
+                        score *= (1 + 0.2 * similar_count)
+                    yield ConsensusIssue(finding, signal.perspective,
+                        signal.confidence, min(score, 1.0))
+
+        # only the top issues are ever materialized (nlargest is stable like sort)
+        consensus_issues = heapq.nlargest(20, scored(), key=lambda x: x.resonance_score)
         confidences = [s.confidence for s in signals]
         resonance_strength = sum(confidences) / len(confidences) if confidences else 0
         total_phi_delta = sum(s.phi_impact for s in signals) / len(signals) if signals else 0
 
-        return ResonanceResult(amplified_signals=signals, consensus_issues=consensus_issues[:20],
+        return ResonanceResult(amplified_signals=signals, consensus_issues=consensus_issues,
             total_phi_delta=total_phi_delta, resonance_strength=resonance_strength)
 
-    def run_full_analysis(self):
+    def _strata(self, files):
+        """Group files by top-level directory and size bucket"""
+        strata = {}
+        for filepath in files:
+            rel = os.path.relpath(filepath, self.project_root)
+            top = rel.split(os.sep, 1)[0] if os.sep in rel else "."
+            try:
+                size = os.path.getsize(filepath)
+            except OSError:
+                size = 0
+            bucket = sum(size >= edge for edge in SAMPLE_SIZE_EDGES)
+            strata.setdefault((top, bucket), []).append(filepath)
+        return strata
+
+    @staticmethod
+    def _allocate(remaining, drawn, budget):
+        """Split one round's budget across strata, never exceeding it
+
+        Strata not sampled yet get one file first (largest first, while the
+        budget lasts); the rest is shared proportionally to what is left,
+        rounding by largest remainder.
+        """
+        take = {key: 0 for key in remaining}
+        for key in sorted(remaining, key=remaining.get, reverse=True):
+            if budget <= 0:
+                return take
+            if not drawn[key]:
+                take[key] = 1
+                budget -= 1
+        left = {key: remaining[key] - take[key] for key in remaining}
+        weight = sum(left.values())
+        if budget <= 0 or not weight:
+            return take
+        shares = {key: budget * n / weight for key, n in left.items()}
+        for key, share in shares.items():
+            take[key] += int(share)
+        extra = budget - sum(int(share) for share in shares.values())
+        for key in sorted(shares, key=lambda k: shares[k] - int(shares[k]), reverse=True)[:extra]:
+            take[key] += 1
+        return take
+
+    def run_sampled_analysis(self, batch_size=40, tolerance=0.005, stable_rounds=2,
+                             z=1.96, seed=None, full_scan_phi_delta=0.03):
+        """Estimate the full analysis from a stratified random sample of files
+
+        Files are stratified by top-level directory and size bucket and drawn
+        in rounds of `batch_size`, allocated proportionally to stratum size.
+        Sampling stops once resonance_strength and total_phi_delta have moved
+        by at most `tolerance` for `stable_rounds` consecutive rounds. Per
+        perspective it reports the stratified share of files with findings
+        and a normal-approximation confidence interval (with finite population
+        correction). recommend_full_scan is set when the estimate crosses
+        `full_scan_phi_delta` or a HIGH/CRITICAL finding was sampled.
+        """
+        rng = random.Random(seed)
+        files = self.tools.find_python_files()
+        strata = self._strata(files)
+        for members in strata.values():
+            rng.shuffle(members)
+        total = len(files)
+        file_perspectives = [p for p in self.perspectives if p != Perspective.EVOLUTION]
+        drawn = {key: 0 for key in strata}
+        hits = {key: Counter() for key in strata}
+        sample_findings = {p: [] for p in file_perspectives}
+        previous, stable, rounds = None, 0, 0
+
+        def estimate():
+            signals = [self.make_signal(p, sample_findings[p]) for p in file_perspectives]
+            signals.append(self.analyze_from_perspective(Perspective.EVOLUTION, files))
+            return self.resonate(signals)
+
+        result = estimate() if not total else None
+
+        print("")
+        print("=" * 70)
+        print("RESONANT ANALYZER - sampled pre-check")
+        print("=" * 70)
+        print(f"Files found: {total}")
+
+        while sum(drawn.values()) < total:
+            rounds += 1
+            remaining = {k: len(v) - drawn[k] for k, v in strata.items() if len(v) > drawn[k]}
+            budget = min(batch_size, sum(remaining.values()))
+            for key, take in self._allocate(remaining, drawn, budget).items():
+                for filepath in strata[key][drawn[key]:drawn[key] + take]:
+                    for perspective in file_perspectives:
+                        found = self._file_findings(perspective, filepath)
+                        if found:
+                            hits[key][perspective] += 1
+                            sample_findings[perspective].extend(found)
+                drawn[key] += take
+
+            result = estimate()
+            current = (result.resonance_strength, result.total_phi_delta)
+            if previous is not None and all(abs(a - b) <= tolerance
+                                            for a, b in zip(current, previous)):
+                stable += 1
+            else:
+                stable = 0
+            previous = current
+            print(f"  round {rounds}: sampled={sum(drawn.values())}/{total} "
+                  f"strength={current[0]:.3f} phi_delta={current[1]:.4f}")
+            if stable >= stable_rounds:
+                break
+
+        sampled = sum(drawn.values())
+        rates = {}
+        for perspective in file_perspectives:
+            rate, variance = 0.0, 0.0
+            for key, members in strata.items():
+                n, size = drawn[key], len(members)
+                if not n:
+                    continue
+                w = size / total
+                p = hits[key][perspective] / n
+                fpc = (size - n) / (size - 1) if size > 1 else 0.0
+                rate += w * p
+                variance += w * w * p * (1 - p) / n * fpc
+            margin = z * variance ** 0.5
+            rates[perspective.value] = {
+                "rate": round(rate, 4),
+                "ci_low": round(max(0.0, rate - margin), 4),
+                "ci_high": round(min(1.0, rate + margin), 4),
+                "estimated_files": round(rate * total),
+            }
+
+        severe = any(f.severity >= Severity.HIGH for fs in sample_findings.values() for f in fs)
+        recommend = result.total_phi_delta >= full_scan_phi_delta or severe
+        print(f"  Sampled {sampled}/{total} files in {rounds} rounds "
+              f"({'converged' if stable >= stable_rounds else 'exhausted'})")
+        print(f"  Full scan recommended: {recommend}")
+
+        return {
+            "sampled": True,
+            "files_total": total,
+            "files_analyzed": sampled,
+            "rounds": rounds,
+            "converged": stable >= stable_rounds,
+            "perspectives_used": len(self.perspectives),
+            "resonance_strength": result.resonance_strength,
+            "phi_delta": result.total_phi_delta,
+            "finding_rates": rates,
+            "top_issues": [issue.to_dict() for issue in result.consensus_issues[:10]],
+            "recommend_full_scan": recommend,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    @profiled()
+    def run_full_analysis(self, sample=False, report=None, budget=None, **sample_options):
+        """Analyze every file; with sample=True run the sampled pre-check
+        first and only fall through to the full scan when it recommends one
+
+        With a report writer (streaming.open_report) every finding is written
+        as soon as its perspective finishes; closing it is up to the caller.
+        With a budget (seconds) perspectives and file batches are scheduled by
+        their recorded findings per second and whatever would overrun the
+        budget is skipped; the result then carries a "budget" report,
+        perspectives that did not run at all are left out of the resonance
+        and files_analyzed / perspectives_used count only what ran.
+        """
+        started = time.monotonic()
+        if sample:
+            estimate = self.run_sampled_analysis(**sample_options)
+            if not estimate["recommend_full_scan"]:
+                return estimate
+
         print("")
         print("=" * 70)
         print("RESONANT ANALYZER - AI Resonator Architecture")
@@ -221,14 +504,47 @@ class ResonantAnalyzerAgent:
         files = self.tools.find_python_files()
         print(f"Files found: {len(files)}")
 
+        stats = PerspectiveStats(state_path(self.project_root, "perspective_stats.json"))
+        sizes = file_sizes_kb(files)
+        budget_report = None
+        if budget is not None:
+            scheduler = PerspectiveScheduler(stats, budget, started)
+            units = scheduler.schedule(
+                [p for p in self.perspectives if p != Perspective.EVOLUTION], files, sizes)
+            scheduled, budget_report = scheduler.execute(
+                units, lambda p, batch: [f for path in batch for f in self._file_findings(p, path)])
+
         print("Multi-perspective analysis:")
         signals = []
         for perspective in self.perspectives:
-            signal = self.analyze_from_perspective(perspective, files)
+            if budget is None or perspective == Perspective.EVOLUTION:
+                t0 = time.perf_counter()
+                signal = self.analyze_from_perspective(perspective, files)
+                if budget is None and perspective != Perspective.EVOLUTION:
+                    stats.record(perspective.value, time.perf_counter() - t0,
+                                 sum(sizes.values()), len(signal.findings))
+            elif perspective in scheduled:
+                signal = self.make_signal(perspective, scheduled[perspective])
+            else:
+                print(f"  [SKIP] {perspective.value}: over budget")
+                continue
             signals.append(signal)
+            if report is not None:
+                for finding in signal.findings:
+                    report.write_finding(finding)
             status = "OK" if signal.confidence > 0.7 else "WARN"
+            if budget_report is not None and perspective.value in budget_report["partial"]:
+                status = "PARTIAL"
             print(f"  [{status}] {perspective.value}: conf={signal.confidence:.2f}, findings={len(signal.findings)}")
 
+        if budget is None:
+            stats.save()
+        else:
+            skipped = ", ".join(f"{name} ({entry['files']} files)"
+                                for name, entry in budget_report["skipped"].items())
+            print(f"  Budget: {budget_report['elapsed_s']:.1f}s of {budget:.1f}s, "
+                  f"skipped: {skipped or 'none'}")
+
         print("Signal resonance...")
         result = self.resonate(signals)
 
@@ -239,21 +555,40 @@ class ResonantAnalyzerAgent:
         if result.consensus_issues:
             print("TOP ISSUES:")
             for issue in result.consensus_issues[:5]:
-                score = issue.get('resonance_score', 0)
-                print(f"  [{issue.get('severity')}] {issue.get('type')}: {issue.get('message')} (score={score:.2f})")
+                finding = issue.finding
+                print(f"  [{finding.severity.name}] {finding.type.label}: {finding.message} (score={issue.resonance_score:.2f})")
 
-        return {
-            "files_analyzed": len(files),
-            "perspectives_used": len(self.perspectives),
+        summary = {
+            "files_analyzed": len(files) if budget_report is None else budget_report["files_analyzed"],
+            "perspectives_used": len(signals),
             "resonance_strength": result.resonance_strength,
             "consensus_issues": len(result.consensus_issues),
             "phi_delta": result.total_phi_delta,
-            "top_issues": result.consensus_issues[:10],
+            "top_issues": [issue.to_dict() for issue in result.consensus_issues[:10]],
             "timestamp": datetime.now().isoformat()
         }
+        if budget_report is not None:
+            summary["budget"] = budget_report
+        return summary
 
 if __name__ == "__main__":
+    import argparse
+    try:
+        from ..streaming import open_report
+    except ImportError:
+        from streaming import open_report
+    parser = argparse.ArgumentParser(description="Resonant multi-perspective analysis")
+    parser.add_argument("--sample", action="store_true", help="sampled pre-check first")
+    parser.add_argument("--report", help="stream findings to a .jsonl[.gz] or .sarif file")
+    parser.add_argument("--budget", type=float, help="wall-clock budget in seconds")
+    parser.add_argument("--profile", action="store_true", help="cProfile the analysis")
+    args = parser.parse_args()
+    if args.profile:
+        enable_profiling()
     analyzer = ResonantAnalyzerAgent(".")
-    result = analyzer.run_full_analysis()
+    writer = open_report(args.report) if args.report else None
+    result = analyzer.run_full_analysis(sample=args.sample, report=writer, budget=args.budget)
+    if writer is not None:
+        writer.close(result)
     print("=" * 70)
     print(f"Analysis complete. Resonance: {result['resonance_strength']:.2f}")
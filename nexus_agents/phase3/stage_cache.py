@@ -0,0 +1,84 @@
+"""
+StageCache - reuse a stage's last output while its inputs are unchanged
+"""
+import hashlib
+import json
+import os
+
+
+def fingerprint(*inputs):
+    """Stable digest of JSON-serializable stage inputs"""
+    data = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def files_fingerprint(files):
+    """Digest of (path, size, mtime_ns) for each file; missing files count as absent"""
+    stats = []
+    for path in files:
+        try:
+            st = os.stat(path)
+            stats.append((path, st.st_size, st.st_mtime_ns))
+        except OSError:
+            stats.append((path, None, None))
+    return fingerprint(stats)
+
+
+class StageCache:
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file
+        self.entries = self._load()
+        self.hits = []
+        self.misses = []
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.cache_file)
+        except (OSError, TypeError) as e:
+            print(f"  ⚠️  stage cache not saved: {e}")
+
+    def begin_cycle(self):
+        self.hits = []
+        self.misses = []
+
+    def run(self, stage, key, compute, keep=None):
+        """compute() unless the stored output for `stage` has the same key
+
+        With keep, an output is stored only when keep(output) is true;
+        otherwise the stage is recomputed on the next call.
+        """
+        entry = self.entries.get(stage)
+        if entry is not None and entry.get("key") == key:
+            self.hits.append(stage)
+            return entry["output"]
+        output = compute()
+        self.misses.append(stage)
+        if keep is None or keep(output):
+            self.entries[stage] = {"key": key, "output": output}
+        else:
+            self.entries.pop(stage, None)
+        self._save()
+        return output
+
+    def report(self):
+        return {"hits": list(self.hits), "misses": list(self.misses)}
+
+
+def cached(cache, stage, key, compute, keep=None):
+    """StageCache.run when a cache is given, plain compute() otherwise"""
+    if cache is None:
+        return compute()
+    return cache.run(stage, key, compute, keep)
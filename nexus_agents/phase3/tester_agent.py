@@ -3,29 +3,121 @@ TesterAgent - Automatic validation of NEXUS Evolution changes
 """
 import json
 import os
-import ast
+import sys
+import time
+import hashlib
+import statistics
+import subprocess
 from datetime import datetime
 
+try:
+    from ..state import state_path
+    from ..walker import ProjectWalker
+    from .stage_cache import cached, fingerprint, files_fingerprint
+except ImportError:  # run as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from state import state_path
+    from walker import ProjectWalker
+    from stage_cache import cached, fingerprint, files_fingerprint
+
+# Below this many uncached files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 16
+
+IMPORT_PACKAGE = "nexus_agents"
+IMPORT_SCRIPTS = ["run_extended_evolution.py", os.path.join("scripts", "standalone_evolution.py")]
+IMPORT_MARKER = "--nexus-import-probe--"
+
+
+def _compile_source(filepath, source):
+    """Compile one file's bytes; runs in a worker process"""
+    started = time.perf_counter()
+    try:
+        compile(source, filepath, "exec", dont_inherit=True)
+        result = {"file": filepath, "status": "PASS"}
+    except (SyntaxError, ValueError) as e:
+        result = {"file": filepath, "status": "FAIL", "error": str(e)}
+    result["compile_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
 class TesterAgent:
     def __init__(self, project_root="."):
         self.project_root = project_root
         self.metrics_file = os.path.join(project_root, "metrics.json")
         self.results = {"tests": [], "status": "PENDING"}
 
-    def validate_syntax(self, files=None):
-        """Validate Python syntax of all files"""
+    @property
+    def syntax_cache_file(self):
+        return state_path(self.project_root, "syntax_cache.json")
+
+    def _load_syntax_cache(self):
+        try:
+            with open(self.syntax_cache_file, 'r') as f:
+                return set(json.load(f).get("pass", []))
+        except Exception:
+            return set()
+
+    def _save_syntax_cache(self, hashes):
+        try:
+            tmp = self.syntax_cache_file + ".tmp"
+            with open(tmp, 'w') as f:
+                json.dump({"pass": sorted(hashes)}, f)
+            os.replace(tmp, self.syntax_cache_file)
+        except OSError as e:
+            print(f"  ⚠️  syntax cache not saved: {e}")
+
+    def validate_syntax(self, files=None, workers=None):
+        """Validate Python syntax of all files
+
+        Files whose content hash passed before are skipped; the rest are
+        compiled across a process pool. Only PASS results are cached.
+        """
         if files is None:
             files = self._find_python_files()
-        results = []
+        cache = self._load_syntax_cache()
+        results = {}
+        passed = set()
+        pending = []
+        hits = 0
         for filepath in files:
             try:
-                with open(filepath, 'r') as f:
+                with open(filepath, 'rb') as f:
                     source = f.read()
-                ast.parse(source)
-                results.append({"file": filepath, "status": "PASS"})
-            except SyntaxError as e:
-                results.append({"file": filepath, "status": "FAIL", "error": str(e)})
-        return {"test": "syntax", "results": results, "status": "PASS" if all(r["status"]=="PASS" for r in results) else "FAIL"}
+            except OSError as e:
+                results[filepath] = {"file": filepath, "status": "FAIL", "error": str(e)}
+                continue
+            digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+            if digest in cache:
+                results[filepath] = {"file": filepath, "status": "PASS",
+                                     "compile_ms": 0.0, "cached": True}
+                passed.add(digest)
+                hits += 1
+            else:
+                pending.append((filepath, source, digest))
+
+        if len(pending) >= PARALLEL_MIN_FILES:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_compile_source, p, src) for p, src, _ in pending]
+                compiled = [future.result() for future in futures]
+        else:
+            compiled = [_compile_source(p, src) for p, src, _ in pending]
+
+        for (filepath, _, digest), result in zip(pending, compiled):
+            result["cached"] = False
+            results[filepath] = result
+            if result["status"] == "PASS":
+                passed.add(digest)
+
+        if passed != cache:
+            self._save_syntax_cache(passed)
+
+        ordered = [results[f] for f in files]
+        return {"test": "syntax", "results": ordered,
+                "files": len(ordered),
+                "cache_hits": hits,
+                "compile_ms": round(sum(r.get("compile_ms", 0) for r in ordered), 3),
+                "status": "PASS" if all(r["status"]=="PASS" for r in ordered) else "FAIL"}
 
     def validate_metrics(self):
         """Validate metrics.json structure and values"""
@@ -51,23 +143,126 @@ class TesterAgent:
                 results.append({"module": mod, "status": "FAIL"})
         return {"test": "imports", "results": results, "status": "PASS" if all(r["status"]=="PASS" for r in results) else "FAIL"}
 
+    def _import_targets(self):
+        """Every nexus_agents module plus the entry scripts, as (name, code)"""
+        targets = []
+        for path in self._find_python_files():
+            parts = os.path.relpath(path, self.project_root)[:-3].split(os.sep)
+            if parts[0] != IMPORT_PACKAGE:
+                continue
+            if parts[-1] == "__init__":
+                parts.pop()
+            module = ".".join(parts)
+            targets.append((module, f"import {module}"))
+        for script in IMPORT_SCRIPTS:
+            if os.path.exists(os.path.join(self.project_root, script)):
+                code = f"import runpy; runpy.run_path({script!r}, run_name='__import_probe__')"
+                targets.append((script, code))
+        return targets
+
+    def _measure_import(self, code, repeats):
+        """Median cold import cost in µs over N fresh interpreters, from -X importtime"""
+        probe = f"import sys; sys.stderr.write({IMPORT_MARKER!r} + '\\n'); sys.stderr.flush(); {code}"
+        runs = []
+        for _ in range(repeats):
+            proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                                  capture_output=True, text=True, cwd=self.project_root,
+                                  timeout=60)
+            if proc.returncode != 0:
+                error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "exit code"
+                return None, [], error
+            total, modules = 0, []
+            _, _, tail = proc.stderr.partition(IMPORT_MARKER)
+            for line in tail.splitlines():
+                if not line.startswith("import time:"):
+                    continue
+                fields = line[len("import time:"):].split("|")
+                if len(fields) != 3 or not fields[0].strip().isdigit():
+                    continue
+                self_us, cumulative_us = int(fields[0]), int(fields[1])
+                name = fields[2][1:]
+                modules.append((self_us, name.strip()))
+                if not name.startswith(" "):
+                    total += cumulative_us
+            runs.append((total, modules))
+        median = statistics.median_low(total for total, _ in runs)
+        modules = next(m for total, m in runs if total == median)
+        heaviest = [{"module": m, "self_us": us} for us, m in sorted(modules, reverse=True)[:5]]
+        return median, heaviest, None
+
+    def test_import_time(self, threshold=0.25, min_delta_us=20000, repeats=5,
+                         update_baseline=False):
+        """Cold-import every project module in a subprocess and gate on regressions
+
+        The first run (or update_baseline=True) records the baseline. A target
+        fails when its median import time grows by more than `threshold`
+        relative and `min_delta_us` absolute over the baseline, or when it
+        fails to import. Single cold starts vary by tens of percent, so both
+        margins are needed to keep the gate quiet on an unchanged tree.
+        Baselines are kept per interpreter, so an upgrade starts a new one
+        instead of showing up as a regression.
+        """
+        baseline_file = state_path(self.project_root, "import_baseline.json")
+        try:
+            with open(baseline_file, 'r') as f:
+                baselines = json.load(f)
+        except Exception:
+            baselines = {}
+        interpreter = f"{sys.executable} {' '.join(sys.version.split())}"
+        baseline = baselines.get(interpreter)
+        if not isinstance(baseline, dict):
+            baseline = {}
+        # drop the pre-interpreter flat format, whose entries are plain numbers
+        baselines = {k: v for k, v in baselines.items() if isinstance(v, dict)}
+        baselines[interpreter] = baseline
+
+        results = []
+        for name, code in self._import_targets():
+            import_us, heaviest, error = self._measure_import(code, repeats)
+            entry = {"target": name, "import_us": import_us, "heaviest": heaviest}
+            if import_us is None:
+                entry.update(status="FAIL", error=error)
+            else:
+                base = baseline.get(name)
+                entry["baseline_us"] = base
+                regressed = (base is not None and not update_baseline
+                             and import_us > base * (1 + threshold)
+                             and import_us - base > min_delta_us)
+                entry["status"] = "FAIL" if regressed else "PASS"
+                if base is None or update_baseline:
+                    baseline[name] = import_us
+            results.append(entry)
+
+        try:
+            with open(baseline_file, 'w') as f:
+                json.dump(baselines, f, indent=2, sort_keys=True)
+        except OSError as e:
+            print(f"  ⚠️  import baseline not saved: {e}")
+
+        return {"test": "import_time", "results": results,
+                "total_us": sum(r["import_us"] or 0 for r in results),
+                "status": "PASS" if all(r["status"]=="PASS" for r in results) else "FAIL"}
+
     def _find_python_files(self):
         """Find all Python files in project"""
-        files = []
-        for root, dirs, filenames in os.walk(self.project_root):
-            if '.git' in root or '__pycache__' in root:
-                continue
-            for f in filenames:
-                if f.endswith('.py'):
-                    files.append(os.path.join(root, f))
-        return files[:10]
+        return ProjectWalker(self.project_root).python_files()
 
-    def run(self):
-        """Run all tests"""
+    def run(self, stage_cache=None, import_time=False):
+        """Run all tests
+
+        The import-time gate starts a few interpreters per module, so it
+        only runs with import_time=True. With a StageCache, the syntax check
+        and a passing import-time check are reused while no Python file
+        (path, size, mtime) and no interpreter has changed.
+        """
         print("\n🧪 TesterAgent запущен")
         print("-" * 70)
 
-        syntax = self.validate_syntax()
+        files = self._find_python_files()
+        sources_key = files_fingerprint(files)
+
+        syntax = cached(stage_cache, "tester.syntax", fingerprint(sources_key, sys.version),
+                        lambda: self.validate_syntax(files))
         print(f"  🔍 Синтаксис: {syntax['status']}")
 
         metrics = self.validate_metrics()
@@ -76,17 +271,42 @@ class TesterAgent:
         imports = self.test_imports()
         print(f"  📦 Импорты: {imports['status']}")
 
-        overall = "PASS" if all(t["status"]=="PASS" for t in [syntax, metrics, imports]) else "FAIL"
+        tests = {"syntax": syntax, "metrics": metrics, "imports": imports}
+        if import_time:
+            # timings are noisy: a FAIL is re-measured next cycle, not replayed
+            tests["import_time"] = cached(stage_cache, "tester.import_time",
+                                          fingerprint(sources_key, sys.executable, sys.version),
+                                          self.test_import_time,
+                                          keep=lambda result: result["status"] == "PASS")
+            print(f"  ⏱️  Время импорта: {tests['import_time']['status']} "
+                  f"({tests['import_time']['total_us'] / 1000:.1f} ms)")
+
+        overall = "PASS" if all(t["status"]=="PASS" for t in tests.values()) else "FAIL"
         print(f"\n✅ Тестирование завершено: {overall}")
 
         return {
             "overall_status": overall,
-            "tests": {"syntax": syntax, "metrics": metrics, "imports": imports},
+            "tests": tests,
             "timestamp": datetime.now().isoformat()
         }
 
 if __name__ == "__main__":
+    import argparse
+    try:
+        from ..streaming import write_report
+    except ImportError:
+        from streaming import write_report
+    parser = argparse.ArgumentParser(description="Validate NEXUS evolution changes")
+    parser.add_argument("--report", help="write failures as .jsonl[.gz] or .sarif")
+    parser.add_argument("--import-time", action="store_true",
+                        help="also gate on cold import time regressions")
+    args = parser.parse_args()
     tester = TesterAgent()
-    result = tester.run()
-    print(json.dumps(result, indent=2))
-
+    result = tester.run(import_time=args.import_time)
+    if args.report:
+        failures = [{"type": "syntax_error", "file": r["file"], "message": r.get("error", ""),
+                     "severity": "HIGH"}
+                    for r in result["tests"]["syntax"]["results"] if r["status"] == "FAIL"]
+        write_report(args.report, result, failures)
+    else:
+        print(json.dumps(result, indent=2))
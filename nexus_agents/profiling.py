@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NEXUS Profiling - opt-in cProfile around agent and loop cycles
+
+Enabled with NEXUS_PROFILE=1 or the --profile flag of the entry scripts.
+Each @profiled cycle is run under cProfile, its stats are written to
+.nexus_cache/profiles (only the newest files are kept) and the top
+hotspots are printed and attached to the cycle result as "profile".
+Only the outermost profiled call is collected, so a pipeline cycle's
+profile already contains the agent cycles it runs. cProfile sees only the
+calling thread; time spent in worker threads shows up as waiting.
+
+When disabled a wrapped call costs one attribute check.
+"""
+
+import os
+import time
+import functools
+import threading
+from datetime import datetime
+
+try:
+    from .state import state_path
+except ImportError:
+    from state import state_path
+
+ENV_VAR = "NEXUS_PROFILE"
+TOP_N = 15
+KEEP_PROFILES = 50
+
+
+class _Config:
+    enabled = os.getenv(ENV_VAR, "").lower() not in ("", "0", "false", "no", "off")
+    project_root = "."
+    top_n = TOP_N
+    keep = KEEP_PROFILES
+
+
+config = _Config()
+# one collector per process: cProfile and sys.setprofile do not nest
+_busy = threading.Lock()
+
+
+def enable(project_root=".", top_n=TOP_N, keep=KEEP_PROFILES):
+    config.enabled = True
+    config.project_root = project_root
+    config.top_n = top_n
+    config.keep = keep
+
+
+def disable():
+    config.enabled = False
+
+
+def profiled(name=None):
+    """Decorator: profile the call when profiling is on, attach hotspots to a dict result"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not config.enabled:
+                return func(*args, **kwargs)
+            label = name or (f"{type(args[0]).__name__}.{func.__name__}" if args
+                             else func.__qualname__)
+            # agents and loops carry their own project_root; profiles go there
+            root = getattr(args[0], "project_root", None) if args else None
+            return _run_profiled(label, root or config.project_root, func, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def _run_profiled(label, root, func, args, kwargs):
+    if not _busy.acquire(blocking=False):
+        return func(*args, **kwargs)  # nested, or another thread is profiling
+    try:
+        import cProfile
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        _busy.release()
+
+    try:
+        summary = _summarize(profiler, label, root, elapsed_ms)
+    except Exception as e:
+        print(f"⚠️  profile not saved: {e}")
+        return result
+    print(f"\n🔬 Profile {label}: {elapsed_ms:.1f} ms → {summary['file']}")
+    for spot in summary["hotspots"]:
+        print(f"  {spot['tottime_ms']:>9.1f} ms own {spot['cumtime_ms']:>9.1f} ms cum "
+              f"{spot['calls']:>7}  {spot['function']}")
+    if isinstance(result, dict):
+        result["profile"] = summary
+    return result
+
+
+def _summarize(profiler, label, root, elapsed_ms):
+    import pstats
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    path = state_path(root, "profiles", f"{stamp}-{label}-{os.getpid()}.prof")
+    profiler.dump_stats(path)
+    _rotate(os.path.dirname(path), config.keep)
+
+    stats = pstats.Stats(profiler)
+    # by own time: the functions where the cycle actually spends it
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    hotspots = []
+    for (filename, line, funcname), (_, calls, tottime, cumtime, _) in rows:
+        if filename == "~" and funcname.startswith("<method 'disable'"):
+            continue
+        hotspots.append({
+            "function": f"{_short(filename)}:{line}({funcname})",
+            "calls": calls,
+            "tottime_ms": round(tottime * 1000, 2),
+            "cumtime_ms": round(cumtime * 1000, 2),
+        })
+        if len(hotspots) >= config.top_n:
+            break
+    return {"label": label, "file": path, "elapsed_ms": round(elapsed_ms, 2),
+            "hotspots": hotspots}
+
+
+def _short(filename):
+    parts = filename.replace(os.sep, "/").split("/")
+    return "/".join(parts[-2:])
+
+
+def _rotate(directory, keep):
+    try:
+        profiles = sorted(f for f in os.listdir(directory) if f.endswith(".prof"))
+        for old in profiles[:-keep] if keep else []:
+            os.remove(os.path.join(directory, old))
+    except OSError:
+        pass
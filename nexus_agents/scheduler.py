@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+NEXUS Agent Scheduler - resident daemon for evolution agents
+Runs each agent on its own jittered interval inside one long-lived process,
+so pipelines and pooled HTTP connections survive between cycles.
+"""
+
+import argparse
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Union
+
+from . import profiling
+from .evo_core import Deadline
+
+
+Interval = Union[float, Callable[[], float]]
+
+
+class ScheduledJob:
+    """One recurring job and its run bookkeeping
+
+    interval may be a callable; it is re-evaluated every time the job is
+    rescheduled, which lets a job adapt its own cadence.
+    """
+
+    def __init__(self, name: str, func: Callable[[Deadline], Dict], interval: Interval,
+                 jitter: float = 0.1, budget: Optional[float] = None,
+                 overlap: str = "coalesce"):
+        if overlap not in ("coalesce", "skip"):
+            raise ValueError(f"unknown overlap policy: {overlap}")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.current_interval = interval() if callable(interval) else interval
+        self.fixed_budget = budget
+        self.overlap = overlap
+        self.next_run = time.monotonic()
+        self.running = False
+        self.pending = False
+        self.runs = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.last_result: Optional[Dict] = None
+        self.last_error: Optional[str] = None
+        self.last_duration = 0.0
+
+    @property
+    def budget(self) -> float:
+        return self.fixed_budget if self.fixed_budget is not None else self.current_interval
+
+    def schedule_next(self, now: float):
+        if callable(self.interval):
+            try:
+                self.current_interval = self.interval()
+            except Exception as e:
+                print(f"[scheduler] {self.name} interval fallback: {e}")
+        spread = self.current_interval * self.jitter
+        self.next_run = now + max(0.0, self.current_interval + random.uniform(-spread, spread))
+
+    def stats(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "interval": round(self.current_interval, 3),
+            "last_duration": round(self.last_duration, 3),
+            "last_error": self.last_error
+        }
+
+
+class AgentScheduler:
+    """Jittered interval scheduler with per-job backpressure and graceful stop
+
+    A job that is still running when it comes due is never started twice:
+    with the "coalesce" policy all missed ticks collapse into one extra run
+    right after the current one, with "skip" they are dropped.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.jobs: List[ScheduledJob] = []
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def add_job(self, name: str, func: Callable[[Deadline], Dict], interval: Interval,
+                jitter: float = 0.1, budget: Optional[float] = None,
+                overlap: str = "coalesce") -> ScheduledJob:
+        job = ScheduledJob(name, func, interval, jitter, budget, overlap)
+        self.jobs.append(job)
+        return job
+
+    def _submit(self, job: ScheduledJob):
+        job.running = True
+        self._executor.submit(self._execute, job)
+
+    def _execute(self, job: ScheduledJob):
+        started = time.monotonic()
+        try:
+            job.last_result = job.func(Deadline(job.budget))
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            print(f"[scheduler] {job.name} failed: {e}")
+        finally:
+            job.last_duration = time.monotonic() - started
+            job.runs += 1
+            with self._lock:
+                job.running = False
+                if job.pending and not self._stop.is_set():
+                    job.pending = False
+                    self._submit(job)
+
+    def _tick(self, now: float):
+        with self._lock:
+            for job in self.jobs:
+                if now < job.next_run:
+                    continue
+                job.schedule_next(now)
+                if not job.running:
+                    self._submit(job)
+                elif job.overlap == "coalesce" and not job.pending:
+                    job.pending = True
+                    job.coalesced += 1
+                else:
+                    job.skipped += 1
+
+    def run(self, duration: Optional[float] = None) -> Dict:
+        """Block until stop() or until duration seconds have passed"""
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers or max(1, len(self.jobs)),
+            thread_name_prefix="nexus-job"
+        )
+        ends_at = None if duration is None else time.monotonic() + duration
+        print(f"[scheduler] started {len(self.jobs)} jobs at {datetime.now().isoformat()}")
+
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if ends_at is not None and now >= ends_at:
+                    break
+                self._tick(now)
+                wake = min(job.next_run for job in self.jobs) if self.jobs else now + 1.0
+                if ends_at is not None:
+                    wake = min(wake, ends_at)
+                self._stop.wait(max(0.0, wake - time.monotonic()))
+        finally:
+            with self._lock:
+                self._stop.set()
+            self._executor.shutdown(wait=True)
+            print("[scheduler] stopped")
+
+        return {job.name: job.stats() for job in self.jobs}
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+
+def forecast_interval(optimizer, base: float, max_factor: float = 4.0,
+                      horizon: int = 10) -> Callable[[], float]:
+    """Interval that stretches up to max_factor x base while φ is unlikely to
+    reach the alert threshold within `horizon` cycles (OptimizerAgent forecast)"""
+    def interval() -> float:
+        forecast = optimizer.forecast_phi(horizon=horizon, paths=20_000)
+        if forecast.get("status") != "OK":
+            return base
+        return base * (1 + (max_factor - 1) * (1 - forecast["p_cross"]))
+    return interval
+
+
+def build_default_scheduler(project_root: str = ".", analyzer_interval: float = 300,
+                            developer_interval: float = 600, extended_interval: float = 0,
+                            jitter: float = 0.1) -> AgentScheduler:
+    """Scheduler wired to one shared EvolutionPipeline (and optional extended loop)"""
+    from .evo_core import EvolutionPipeline
+
+    pipeline = EvolutionPipeline()
+    scheduler = AgentScheduler()
+    if analyzer_interval > 0:
+        scheduler.add_job("analyzer", pipeline.run_analysis, analyzer_interval, jitter)
+    if developer_interval > 0:
+        scheduler.add_job("developer", pipeline.run_development, developer_interval, jitter)
+    if extended_interval > 0:
+        from .phase3.extended_evolution_loop import ExtendedEvolutionLoop
+        from .phase3.optimizer_agent import OptimizerAgent
+        loop = ExtendedEvolutionLoop(project_root)
+        scheduler.add_job("extended", lambda deadline: loop.run_extended_cycle(),
+                          forecast_interval(OptimizerAgent(project_root), extended_interval),
+                          jitter)
+    return scheduler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NEXUS resident agent scheduler")
+    parser.add_argument("--analyzer-interval", type=float, default=300)
+    parser.add_argument("--developer-interval", type=float, default=600)
+    parser.add_argument("--extended-interval", type=float, default=0,
+                        help="run ExtendedEvolutionLoop cycles too (0 = off)")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--duration", type=float, default=None,
+                        help="stop after this many seconds (default: run until signalled)")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile each cycle into .nexus_cache/profiles")
+    args = parser.parse_args(argv)
+    if args.profile:
+        profiling.enable()
+
+    scheduler = build_default_scheduler(".", args.analyzer_interval, args.developer_interval,
+                                        args.extended_interval, args.jitter)
+    scheduler.install_signal_handlers()
+    stats = scheduler.run(args.duration)
+    for name, job_stats in stats.items():
+        print(f"  {name}: {job_stats}")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+NEXUS local state - one ignored directory for caches, cursors and baselines
+"""
+import os
+
+STATE_DIR = ".nexus_cache"
+
+
+def state_path(project_root, *parts, create=True):
+    """Path under <project_root>/.nexus_cache, creating parent directories
+
+    With create=False nothing is touched; the writer then creates the
+    directory itself, so merely reading state never adds .nexus_cache.
+    """
+    path = os.path.join(project_root, STATE_DIR, *parts)
+    if create:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NEXUS Streaming Output - append-only JSONL records and streamed reports
+Records are written as they are produced, so memory stays flat and partial
+results survive a crash. Encoding uses orjson when it is installed and the
+standard library otherwise; both produce the same bytes (compact
+separators, non-ASCII kept, floats in orjson's shortest form, NaN and
+infinities as null).
+"""
+
+import dataclasses
+import datetime
+import enum
+import gzip
+import io
+import json
+import os
+import re
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_INF = float("inf")
+
+
+def _float_str(value):
+    """orjson's float format, derived from repr (same shortest digits)"""
+    if value != value or value == _INF or value == -_INF:
+        return "null"
+    text = repr(value)
+    mantissa, marker, exponent = text.partition("e")
+    if not marker:
+        return text
+    exponent = int(exponent)
+    if exponent == -5:
+        # orjson keeps fixed notation one decade further down than repr
+        sign = "-" if mantissa.startswith("-") else ""
+        return f"{sign}0.0000{mantissa.lstrip('-').replace('.', '')}"
+    return f"{mantissa}e{exponent}"
+
+
+def _default(obj):
+    """Types both backends hand to us: enums, dates, dataclasses, to_dict()"""
+    if isinstance(obj, tuple):
+        # only orjson gets here (for namedtuples); json encodes them as lists
+        return list(obj)
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default)
+# repr-style exponents and NaN/Infinity are the only places json and orjson differ
+_NEEDS_FIXUP = re.compile(r"\de[+-]|NaN|Infinity")
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|(-?\d+(?:\.\d+)?e[+-]?\d+)|(NaN|-?Infinity)')
+
+
+def _fix_token(match):
+    if match.group(1):
+        return _float_str(float(match.group(1)))
+    if match.group(2):
+        return "null"
+    return match.group(0)
+
+
+def _dumps_stdlib(obj):
+    text = _encoder.encode(obj)
+    if (("e+" in text or "e-" in text or "NaN" in text or "Infinity" in text)
+            and _NEEDS_FIXUP.search(text)):
+        # walk the tokens so string contents are never touched
+        text = _TOKEN.sub(_fix_token, text)
+    return text
+
+
+if orjson is not None:
+    _ORJSON_OPTS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                    | orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+    def _dumps_orjson(obj):
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS).decode("utf-8")
+        except TypeError:
+            # ints beyond 64 bits, non-str keys, ...: the reference encoder
+            # handles them with the same formatting rules
+            return _dumps_stdlib(obj)
+
+    BACKEND = "orjson"
+    dumps = _dumps_orjson
+else:
+    BACKEND = "json"
+    dumps = _dumps_stdlib
+
+
+def _open(path, mode, compress):
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class JsonlSink:
+    """Thread-safe buffered JSONL writer (gzip when the path ends in .gz)
+
+    Each record is one line. Writes go through an in-memory buffer that is
+    flushed to the file every `buffer_size` bytes and on close, so a crash
+    loses at most one buffer of records.
+    """
+
+    def __init__(self, path, append=True, compress=None, buffer_size=64 * 1024):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._file = _open(path, "a" if append else "w", compress)
+        self._buffer = io.StringIO()
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = dumps(record) + "\n"
+        with self._lock:
+            self._buffer.write(line)
+            self.count += 1
+            if self._buffer.tell() >= self.buffer_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        data = self._buffer.getvalue()
+        if data:
+            self._file.write(data)
+            self._file.flush()
+            self._buffer = io.StringIO()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked()
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_jsonl(path, compress=None):
+    """Lazily yield records from a JSONL file, skipping a torn last line"""
+    with _open(path, "r", compress) as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    if line.endswith("\n"):
+                        raise
+        except EOFError:
+            # truncated gzip member from an interrupted writer
+            return
+
+
+# ═══════════════════════════════════════════════════════════════
+# Streamed reports: JSONL and SARIF
+# ═══════════════════════════════════════════════════════════════
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {"CRITICAL": "error", "HIGH": "error", "MEDIUM": "warning",
+                "LOW": "note", "INFO": "note"}
+
+
+def _as_dict(finding):
+    return finding.to_dict() if hasattr(finding, "to_dict") else finding
+
+
+class JsonlReportWriter:
+    """Report as JSONL: one {"kind": "finding", ...} line per finding as it
+    arrives, other records as they are written, the summary line last"""
+
+    def __init__(self, path, compress=None):
+        self.path = path
+        self.count = 0
+        self._sink = JsonlSink(path, append=False, compress=compress)
+
+    def write_finding(self, finding):
+        self._sink.write(dict(kind="finding", **_as_dict(finding)))
+        self.count += 1
+
+    def write_record(self, kind, record):
+        self._sink.write(dict(kind=kind, **record) if isinstance(record, dict)
+                         else {"kind": kind, "value": record})
+
+    def close(self, summary=None):
+        if summary is not None:
+            self._sink.write(dict(kind="summary", **summary))
+        self._sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._sink.close()
+
+
+class SarifWriter:
+    """SARIF 2.1.0 log with a single run, results streamed as they arrive
+
+    Results are written before the tool section, so rules can be collected
+    on the way and emitted at close; JSON member order is not significant.
+    Findings are dicts (or objects with to_dict()) with type, file,
+    message, severity and optional line.
+    """
+
+    def __init__(self, path, tool_name="nexus-resonance", project_root=".",
+                 buffer_size=64 * 1024):
+        self.path = path
+        self.tool_name = tool_name
+        self.project_root = project_root
+        self.buffer_size = buffer_size
+        self.count = 0
+        self.rules = {}
+        self._uris = {}
+        self._file = open(path, "w", encoding="utf-8")
+        self._buffer = io.StringIO()
+        self._buffer.write(f'{{"version":"2.1.0","$schema":{dumps(SARIF_SCHEMA)},"runs":[{{"results":[')
+
+    def _uri(self, file):
+        uri = self._uris.get(file)
+        if uri is None:
+            rel = os.path.relpath(file, self.project_root) if os.path.isabs(file) or \
+                file.startswith(os.curdir + os.sep) else file
+            uri = self._uris[file] = rel.replace(os.sep, "/")
+        return uri
+
+    def write_finding(self, finding):
+        finding = _as_dict(finding)
+        rule_id = finding.get("type", "finding")
+        self.rules.setdefault(rule_id, {"id": rule_id,
+                                        "shortDescription": {"text": rule_id.replace("_", " ")}})
+        result = {"ruleId": rule_id,
+                  "level": SARIF_LEVELS.get(finding.get("severity"), "warning"),
+                  "message": {"text": finding.get("message", "")}}
+        file = finding.get("file")
+        if file and file != "project":
+            location = {"artifactLocation": {"uri": self._uri(file)}}
+            if finding.get("line"):
+                location["region"] = {"startLine": finding["line"]}
+            result["locations"] = [{"physicalLocation": location}]
+        if self.count:
+            self._buffer.write(",")
+        self._buffer.write(dumps(result))
+        self.count += 1
+        if self._buffer.tell() >= self.buffer_size:
+            self._flush()
+
+    def _flush(self):
+        self._file.write(self._buffer.getvalue())
+        self._buffer = io.StringIO()
+
+    def close(self, summary=None):
+        if self._file is None:
+            return
+        run_tail = {"tool": {"driver": {"name": self.tool_name,
+                                        "rules": list(self.rules.values())}}}
+        if summary is not None:
+            run_tail["properties"] = summary
+        self._buffer.write("]," + dumps(run_tail)[1:] + "]}")
+        self._flush()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_report(path, format=None, **kwargs):
+    """Report writer chosen by format ("jsonl"/"sarif") or by file extension"""
+    if format is None:
+        format = "sarif" if path.endswith((".sarif", ".sarif.json")) else "jsonl"
+    if format == "sarif":
+        return SarifWriter(path, **kwargs)
+    if format == "jsonl":
+        return JsonlReportWriter(path, **kwargs)
+    raise ValueError(f"unknown report format: {format!r}")
+
+
+def _stream_lists(writer, mapping, prefix=""):
+    """Write every list in mapping, at any dict depth, one record per item
+    with its dotted key as the kind; returns mapping without those lists"""
+    rest = {}
+    for key, value in mapping.items():
+        kind = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, list):
+            for item in value:
+                writer.write_record(kind, item)
+        elif isinstance(value, dict):
+            rest[key] = _stream_lists(writer, value, kind)
+        else:
+            rest[key] = value
+    return rest
+
+
+def write_report(path, report, findings=(), format=None, **kwargs):
+    """Stream a finished report dict: findings first, then (JSONL) every
+    list-valued key, nested ones included, one record per item, e.g.
+    kind "tests.syntax.results"; the rest of the report is the summary"""
+    with open_report(path, format, **kwargs) as writer:
+        for finding in findings:
+            writer.write_finding(finding)
+        if isinstance(writer, JsonlReportWriter):
+            summary = _stream_lists(writer, report)
+        else:
+            summary = dict(report)
+        writer.close(summary)
+    return writer.count
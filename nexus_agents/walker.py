@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NEXUS Project Walker - the one way agents list project files
+Uses `git ls-files` when the project is a git checkout; otherwise walks with
+os.scandir, honours the root .gitignore and keeps a persisted snapshot so
+unchanged directories are not re-listed.
+"""
+
+import os
+import json
+import fnmatch
+import subprocess
+
+try:
+    from .state import state_path
+except ImportError:
+    from state import state_path
+
+ALWAYS_EXCLUDED = {".git", "__pycache__", ".nexus_cache"}
+SNAPSHOT_VERSION = 1
+
+
+class GitIgnore:
+    """Subset of .gitignore semantics: globs, **, leading /, trailing /, !negation"""
+
+    def __init__(self, lines=()):
+        self.rules = []
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line  # a leading or inner slash anchors to the root
+            line = line.lstrip("/")
+            self.rules.append((line, negate, dir_only, anchored))
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(f.readlines())
+        except OSError:
+            return cls()
+
+    def ignored(self, rel_path, is_dir):
+        result = False
+        name = rel_path.rsplit("/", 1)[-1]
+        for pattern, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            target = rel_path if anchored else name
+            if fnmatch.fnmatchcase(target, pattern) or (
+                    "**/" in pattern and fnmatch.fnmatchcase(target, pattern.replace("**/", ""))):
+                result = not negate
+        return result
+
+
+class ProjectWalker:
+    """Lists project files, preferring git and falling back to a snapshot walk"""
+
+    def __init__(self, project_root=".", use_git=None, snapshot_file=None):
+        self.project_root = project_root
+        self.use_git = use_git
+        self._snapshot_file = snapshot_file
+
+    @property
+    def snapshot_file(self):
+        """Resolved on first use: a git checkout never needs .nexus_cache"""
+        if self._snapshot_file is None:
+            self._snapshot_file = state_path(self.project_root, "snapshot.json")
+        return self._snapshot_file
+
+    def files(self, suffix=".py", max_files=None):
+        """Paths (joined onto project_root) of every non-ignored file with suffix"""
+        rel_paths = None
+        if self.use_git is not False:
+            rel_paths = self._git_files()
+        if rel_paths is None:
+            rel_paths = self._snapshot_files()
+        matched = sorted(p for p in rel_paths if p.endswith(suffix))
+        if max_files is not None:
+            matched = matched[:max_files]
+        return [os.path.join(self.project_root, p) for p in matched]
+
+    def python_files(self, max_files=None):
+        return self.files(".py", max_files)
+
+    def _git_files(self):
+        try:
+            proc = subprocess.run(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                capture_output=True, cwd=self.project_root, timeout=30)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if proc.returncode != 0:
+            return None
+        paths = []
+        for raw in proc.stdout.split(b"\0"):
+            if not raw:
+                continue
+            rel = os.fsdecode(raw)
+            parts = rel.split("/")
+            if ALWAYS_EXCLUDED.intersection(parts[:-1]):
+                continue
+            # tracked files deleted from the work tree are still listed
+            if os.path.exists(os.path.join(self.project_root, rel)):
+                paths.append(rel)
+        return paths
+
+    def _load_snapshot(self, ignore_sig):
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if (snapshot.get("version") == SNAPSHOT_VERSION
+                    and snapshot.get("gitignore") == ignore_sig):
+                return snapshot.get("dirs", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _snapshot_files(self):
+        """Walk with os.scandir, re-listing only directories whose mtime changed
+
+        The snapshot records, per directory, its mtime and the (size, mtime)
+        of the files in it. A directory's mtime changes whenever an entry is
+        added, removed or renamed, so an unchanged mtime means the stored
+        listing is still complete.
+        """
+        gitignore_path = os.path.join(self.project_root, ".gitignore")
+        try:
+            st = os.stat(gitignore_path)
+            ignore_sig = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            ignore_sig = None
+        ignore = GitIgnore.load(gitignore_path)
+        old = self._load_snapshot(ignore_sig)
+        new = {}
+        changed = False
+        paths = []
+
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = os.path.join(self.project_root, rel_dir) if rel_dir else self.project_root
+            try:
+                mtime = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                changed = True
+                continue
+            entry = old.get(rel_dir)
+            if entry is None or entry["mtime_ns"] != mtime:
+                entry = self._scan_dir(abs_dir, rel_dir, mtime, ignore)
+                changed = True
+            new[rel_dir] = entry
+            for name in entry["files"]:
+                paths.append(f"{rel_dir}/{name}" if rel_dir else name)
+            for name in entry["subdirs"]:
+                stack.append(f"{rel_dir}/{name}" if rel_dir else name)
+
+        if changed or set(new) != set(old):
+            self._save_snapshot({"version": SNAPSHOT_VERSION, "gitignore": ignore_sig,
+                                 "dirs": new})
+        return paths
+
+    @staticmethod
+    def _scan_dir(abs_dir, rel_dir, mtime, ignore):
+        files, subdirs = {}, []
+        try:
+            with os.scandir(abs_dir) as entries:
+                for e in entries:
+                    rel = f"{rel_dir}/{e.name}" if rel_dir else e.name
+                    if e.is_dir(follow_symlinks=False):
+                        if e.name not in ALWAYS_EXCLUDED and not ignore.ignored(rel, True):
+                            subdirs.append(e.name)
+                    elif e.is_file() and not ignore.ignored(rel, False):
+                        st = e.stat()
+                        files[e.name] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            pass
+        return {"mtime_ns": mtime, "files": files, "subdirs": sorted(subdirs)}
+
+    def _save_snapshot(self, snapshot):
+        try:
+            tmp = self.snapshot_file + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp, self.snapshot_file)
+        except OSError as e:
+            print(f"⚠️  snapshot not saved: {e}")
+
@@ -1,23 +1,36 @@
 #!/usr/bin/env python3
 """
 NEXUS Phase 3 Extended - Main Entry Point
-Run: python run_extended_evolution.py
+Run: python run_extended_evolution.py [--cycles N] [--import-time] [--profile]
 """
 import os
 import sys
+import argparse
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from nexus_agents.phase3.extended_evolution_loop import ExtendedEvolutionLoop
+from nexus_agents import profiling
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NEXUS Phase 3 extended evolution")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--import-time", action="store_true",
+                        help="fail a cycle's tests when cold import time regresses")
+    parser.add_argument("--profile", action="store_true",
+                        help="cProfile each cycle into .nexus_cache/profiles "
+                             f"(or set {profiling.ENV_VAR}=1)")
+    args = parser.parse_args(argv)
+    if args.profile:
+        profiling.enable(".")
 
-def main():
     print("\n" + "="*70)
     print("🚀 NEXUS PHASE 3 EXTENDED - EVOLUTION SYSTEM")
     print("="*70)
 
-    loop = ExtendedEvolutionLoop(".")
-    results = loop.run_extended_continuous(max_cycles=5)
+    loop = ExtendedEvolutionLoop(".", import_time=args.import_time)
+    results = loop.run_extended_continuous(max_cycles=args.cycles)
 
     print("\n✅ ЭВОЛЮЦИЯ ЗАВЕРШЕНА!")
     print(f"   Циклов: {len(results)}")
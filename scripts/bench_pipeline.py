@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NEXUS Pipeline Benchmark - EvolutionPipeline against local fake endpoints
+
+Starts two in-process HTTP servers: one emulating the VPS bridge `/vps`
+command endpoint (including the fingerprint-then-cat protocol used by
+AnalyzerAgent.fetch_context_phi) and one emulating the GitHub issues API
+with Link-header pagination. Both take configurable latency, error rate
+and payload size. The pipeline is then driven at increasing concurrency
+and throughput, p50/p99 cycle latency and peak memory are reported. Peak
+memory comes from a separate, untimed pass (one cycle per pipeline under
+tracemalloc), because tracing roughly halves throughput. Before the levels
+run, a quick check feeds truncated and malformed ai_context.json bodies
+through the fake bridge and exits non-zero if any of them is accepted.
+
+Run: python scripts/bench_pipeline.py --levels 1,2,4,8 --cycles 20
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import contextlib
+import tracemalloc
+from urllib.parse import urlsplit, parse_qs, urlencode
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexus_agents import evo_core
+from nexus_agents.evo_core import AnalyzerAgent, EvolutionPipeline, iter_agent_phi
+
+_FINGERPRINT_RE = re.compile(r'\[ "\$fp" = "([^"]*)" \]')
+
+
+class FakeConfig:
+    """Behaviour shared by both fake servers"""
+
+    def __init__(self, latency=0.01, jitter=0.005, error_rate=0.0, agents=16,
+                 issues=50, per_page=30, issue_bytes=512, context_changes=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.agents = agents
+        self.issues = issues
+        self.per_page = per_page
+        self.issue_bytes = issue_bytes
+        self.context_changes = context_changes
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.context_version = 1
+        self.context = self._make_context()
+
+    def _make_context(self):
+        return json.dumps({
+            "version": self.context_version,
+            "agents": [{"id": f"agent-{i}", "phi": round(self.rng.uniform(0.1, 0.18), 4)}
+                       for i in range(self.agents)],
+        })
+
+    def delay_and_fail(self):
+        """Sleep for the configured latency; True if this request should fail"""
+        with self.lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            fail = self.rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        time.sleep(delay)
+        return fail
+
+    def current_context(self):
+        with self.lock:
+            if self.rng.random() < self.context_changes:
+                self.context_version += 1
+                self.context = self._make_context()
+            return f"{1700000000 + self.context_version}:{len(self.context)}", self.context
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+
+class VpsHandler(_Handler):
+    """POST /vps {"key", "cmd"} -> {"out": ...}"""
+
+    def do_POST(self):
+        raw = self._read_body()
+        if self.config.delay_and_fail():
+            return self._send(503, '{"error": "unavailable"}')
+        if urlsplit(self.path).path != "/vps":
+            return self._send(404, '{"error": "not found"}')
+        try:
+            cmd = json.loads(raw).get("cmd", "")
+        except ValueError:
+            return self._send(400, '{"error": "bad json"}')
+        fingerprint, context = self.config.current_context()
+        match = _FINGERPRINT_RE.search(cmd)
+        out = fingerprint + "\n"
+        if match is None or match.group(1) != fingerprint:
+            out += context
+        self._send(200, json.dumps({"out": out, "code": 0}))
+
+
+class GitHubHandler(_Handler):
+    """GET /repos/<owner>/<repo>/issues?page=&per_page= with Link pagination"""
+
+    def do_GET(self):
+        if self.config.delay_and_fail():
+            return self._send(502, '{"message": "Bad Gateway"}')
+        parts = urlsplit(self.path)
+        segments = parts.path.strip("/").split("/")
+        if len(segments) != 4 or segments[0] != "repos" or segments[3] != "issues":
+            return self._send(404, '{"message": "Not Found"}')
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        per_page = min(100, int(query.get("per_page", self.config.per_page)))
+        page = max(1, int(query.get("page", 1)))
+        start = (page - 1) * per_page
+        stop = min(self.config.issues, start + per_page)
+        filler = "x" * self.config.issue_bytes
+        issues = [{"number": n + 1, "title": f"Issue {n + 1}", "state": "open",
+                   "labels": [{"name": "auto-fix"}], "body": filler}
+                  for n in range(start, stop)]
+        headers = {}
+        if stop < self.config.issues:
+            query.update(page=page + 1, per_page=per_page)
+            host = self.headers.get("Host")
+            headers["Link"] = f'<http://{host}{parts.path}?{urlencode(query)}>; rel="next"'
+        self._send(200, json.dumps(issues), headers)
+
+
+def start_server(handler, config):
+    handler = type(handler.__name__, (handler,), {"config": config})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _reset_breakers():
+    with evo_core._breakers_lock:
+        evo_core._breakers.clear()
+
+
+def run_level(concurrency, cycles, vps_url, github_url, repos, shards, budget):
+    """Run `cycles` cycles on each of `concurrency` pipelines in parallel"""
+    _reset_breakers()
+    os.environ["GITHUB_API_URL"] = github_url
+    os.environ["NEXUS_VPS_API"] = vps_url
+    repo_names = [f"bench/repo-{i}" for i in range(repos)]
+    pipelines = [EvolutionPipeline(cycle_budget=budget, num_analyzers=shards,
+                                   num_developers=shards, repos=repo_names)
+                 for _ in range(concurrency)]
+    latencies = []
+    lock = threading.Lock()
+
+    def drive(pipeline):
+        for _ in range(cycles):
+            started = time.perf_counter()
+            pipeline.run_evolution_cycle()
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            started = time.perf_counter()
+            list(pool.map(drive, pipelines))
+            wall = time.perf_counter() - started
+
+            tracemalloc.start()
+            list(pool.map(lambda pipeline: pipeline.run_evolution_cycle(), pipelines))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    for pipeline in pipelines:
+        pipeline.close()
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "cycles": len(latencies),
+        "wall_s": round(wall, 3),
+        "cycles_per_s": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "peak_mem_mib": round(peak / 2 ** 20, 2),
+    }
+
+
+def check_context_parsing(agents=16):
+    """Truncated or malformed ai_context.json must not be taken as the new φ
+
+    The fingerprint must stay unset too, or the bridge would report the
+    file unchanged and never send it again. Returns the failures.
+    """
+    config = FakeConfig(latency=0.0, jitter=0.0, agents=agents)
+    server = start_server(VpsHandler, config)
+    os.environ["NEXUS_VPS_API"] = f"http://127.0.0.1:{server.server_address[1]}/vps"
+    good = config.context
+    bodies = {"truncated in agents": good[:len(good) // 2], "missing '}'": good[:-1],
+              "missing ','": good.replace(",", " ", 1), "empty": ""}
+    failures = []
+    try:
+        for name, body in bodies.items():
+            try:
+                list(iter_agent_phi(body))
+                failures.append(f"{name}: iter_agent_phi did not raise")
+            except ValueError:
+                pass
+            config.context = body
+            agent = AnalyzerAgent("check")
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                phi = agent.fetch_context_phi()
+            if phi is not None or agent.context_fingerprint is not None:
+                failures.append(f"{name}: stored phi={phi} fingerprint={agent.context_fingerprint}")
+        config.context = good
+        agent = AnalyzerAgent("check")
+        expected = max(a["phi"] for a in json.loads(good)["agents"])
+        if agent.fetch_context_phi() != expected or agent.context_fingerprint is None:
+            failures.append("complete document not accepted")
+    finally:
+        server.shutdown()
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark EvolutionPipeline against fake endpoints")
+    parser.add_argument("--levels", default="1,2,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--cycles", type=int, default=10, help="cycles per pipeline per level")
+    parser.add_argument("--shards", type=int, default=1, help="analyzers/developers per pipeline")
+    parser.add_argument("--repos", type=int, default=1, help="repositories per pipeline")
+    parser.add_argument("--budget", type=float, default=30.0, help="cycle deadline in seconds")
+    parser.add_argument("--latency", type=float, default=0.01, help="mean response latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.005, help="latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 5xx responses")
+    parser.add_argument("--agents", type=int, default=16, help="agents in the fake ai_context.json")
+    parser.add_argument("--issues", type=int, default=50, help="open issues per repository")
+    parser.add_argument("--per-page", type=int, default=30, help="default GitHub page size")
+    parser.add_argument("--issue-bytes", type=int, default=512, help="body size of each issue")
+    parser.add_argument("--context-changes", type=float, default=0.0,
+                        help="probability the context file changes between fetches")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    _reset_breakers()
+    failures = check_context_parsing()
+    print(f"Context parsing check: {'OK' if not failures else 'FAILED'}")
+    for failure in failures:
+        print(f"  {failure}")
+    if failures:
+        sys.exit(1)
+
+    config = FakeConfig(args.latency, args.jitter, args.error_rate, args.agents, args.issues,
+                        args.per_page, args.issue_bytes, args.context_changes, args.seed)
+    vps = start_server(VpsHandler, config)
+    github = start_server(GitHubHandler, config)
+    vps_url = f"http://127.0.0.1:{vps.server_address[1]}/vps"
+    github_url = f"http://127.0.0.1:{github.server_address[1]}"
+
+    print(f"{'conc':>5} {'cycles':>7} {'cyc/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'peak MiB':>9}")
+    results = []
+    try:
+        for level in (int(x) for x in args.levels.split(",") if x.strip()):
+            row = run_level(level, args.cycles, vps_url, github_url,
+                            args.repos, args.shards, args.budget)
+            results.append(row)
+            print(f"{row['concurrency']:>5} {row['cycles']:>7} {row['cycles_per_s']:>8} "
+                  f"{row['p50_ms']:>9} {row['p99_ms']:>9} {row['peak_mem_mib']:>9}")
+    finally:
+        vps.shutdown()
+        github.shutdown()
+
+    print(f"Fake server requests: {config.requests} ({config.errors} injected errors)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,13 @@
 import os
 import sys
 import json
+import argparse
+import itertools
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nexus_agents.metrics_store import MetricsStore
+
 # Fix encoding for Windows/Linux/Mac compatibility
 if sys.version_info >= (3, 7):
     import io
@@ -16,7 +21,9 @@ class EvolutionMetrics:
 
     def __init__(self, filepath='metrics.json'):
         self.filepath = filepath
+        self.store = MetricsStore(filepath, ensure_ascii=False)
         self.data = self._load_safe()
+        self._base = dict(self.data)
 
     def _load_safe(self):
         """Load metrics with error handling"""
@@ -41,11 +48,30 @@ class EvolutionMetrics:
         return default
 
     def save(self):
-        """Save metrics safely"""
+        """Save metrics safely
+
+        Only what changed since loading is written: the φ and cycle changes
+        are applied as deltas to the latest file and other changed keys are
+        set on it, so concurrent engines do not lose each other's updates.
+        """
         try:
             self.data['timestamp'] = datetime.utcnow().isoformat()
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            base_phi = self._base.get('phi', 0.18)
+            base_cycles = self._base.get('cycles', 0)
+            changed = {k: v for k, v in self.data.items()
+                       if k not in ('phi', 'cycles') and self._base.get(k) != v}
+
+            def apply(current):
+                if not isinstance(current.get('phi'), (int, float)):
+                    current = dict(self._base)
+                phi = current.get('phi', base_phi) + self.data['phi'] - base_phi
+                current['phi'] = max(0.1, min(0.9, phi))
+                current['cycles'] = current.get('cycles', base_cycles) + self.data.get('cycles', 0) - base_cycles
+                current.update(changed)
+                return current
+
+            self.data = self.store.update(apply)
+            self._base = dict(self.data)
             return True
         except Exception as e:
             print(f"❌ Save error: {e}")
@@ -136,10 +162,169 @@ class EvolutionEngine:
         return True
 
 
+DEFAULT_PARAMS = {
+    'delta_up': 0.01,
+    'delta_down': -0.005,
+    'threshold': 0.5,
+    'phi_min': 0.1,
+    'phi_max': 0.9,
+    'reset_below': 0.1,
+    'reset_to': 0.18,
+}
+
+INSTABILITY_PHI = 0.8
+
+
+def _simulate_python(start_phi, params, n_cycles):
+    """Reference loop: same update rule as EvolutionEngine.run_cycle"""
+    summaries = []
+    for p in params:
+        phi = start_phi
+        total = 0.0
+        lo = hi = None
+        first_above = None
+        unstable = 0
+        for cycle in range(1, n_cycles + 1):
+            if phi < p['reset_below']:
+                phi = p['reset_to']
+            phi += p['delta_up'] if phi < p['threshold'] else p['delta_down']
+            phi = max(p['phi_min'], min(p['phi_max'], phi))
+            total += phi
+            lo = phi if lo is None else min(lo, phi)
+            hi = phi if hi is None else max(hi, phi)
+            if first_above is None and phi >= p['threshold']:
+                first_above = cycle
+            if phi > INSTABILITY_PHI:
+                unstable += 1
+        summaries.append({'final_phi': phi, 'min_phi': lo, 'max_phi': hi,
+                          'mean_phi': total / n_cycles, 'first_cycle_at_threshold': first_above,
+                          'unstable_cycles': unstable})
+    return summaries
+
+
+# NumPy pays a fixed cost per step; below this many parameter sets the
+# plain loop is faster (1 set x 1M cycles: ~1 s in Python, ~20 s in NumPy;
+# the two break even at about 20-25 sets)
+NUMPY_MIN_SETS = 32
+
+
+def _use_numpy(n_sets):
+    """NumPy for wide batches when installed; looked up, not imported, here"""
+    if n_sets < NUMPY_MIN_SETS:
+        return False
+    import importlib.util
+    return importlib.util.find_spec("numpy") is not None
+
+
+def _simulate_numpy(start_phi, params, n_cycles):
+    """All parameter sets advance together, a few in-place array ops per step"""
+    import numpy as np
+    cols = {k: np.array([p[k] for p in params], dtype=float) for k in DEFAULT_PARAMS}
+    n = len(params)
+    phi = np.full(n, float(start_phi))
+    total = np.zeros(n)
+    lo = np.full(n, np.inf)
+    hi = np.full(n, -np.inf)
+    first_above = np.zeros(n, dtype=np.int64)
+    unstable = np.zeros(n, dtype=np.int64)
+    # preallocated per-step buffers: the loop itself allocates nothing
+    step = np.empty(n)
+    mask = np.empty(n, dtype=bool)
+    pending = np.ones(n, dtype=bool)
+    for cycle in range(1, n_cycles + 1):
+        np.less(phi, cols['reset_below'], out=mask)
+        np.copyto(phi, cols['reset_to'], where=mask)
+        np.less(phi, cols['threshold'], out=mask)
+        np.copyto(step, cols['delta_down'])
+        np.copyto(step, cols['delta_up'], where=mask)
+        np.add(phi, step, out=phi)
+        np.clip(phi, cols['phi_min'], cols['phi_max'], out=phi)
+        np.add(total, phi, out=total)
+        np.minimum(lo, phi, out=lo)
+        np.maximum(hi, phi, out=hi)
+        np.greater_equal(phi, cols['threshold'], out=mask)
+        np.logical_and(mask, pending, out=mask)
+        np.copyto(first_above, cycle, where=mask)
+        np.logical_xor(pending, mask, out=pending)
+        np.greater(phi, INSTABILITY_PHI, out=mask)
+        np.add(unstable, mask, out=unstable)
+    return [{'final_phi': float(phi[i]), 'min_phi': float(lo[i]), 'max_phi': float(hi[i]),
+             'mean_phi': float(total[i] / n_cycles),
+             'first_cycle_at_threshold': int(first_above[i]) or None,
+             'unstable_cycles': int(unstable[i])}
+            for i in range(n)]
+
+
+def simulate_batch(param_sets, n_cycles, start_phi=None, use_numpy=None):
+    """Simulate n_cycles of the evolution rule for every parameter set
+
+    Nothing is written per step; callers get one summary per parameter set.
+    By default NumPy is used for NUMPY_MIN_SETS or more parameter sets when
+    it is installed, pure Python otherwise; use_numpy forces either one.
+    """
+    if start_phi is None:
+        start_phi = EvolutionMetrics('metrics.json').get_phi()
+    params = [{**DEFAULT_PARAMS, **p} for p in param_sets]
+    if use_numpy is None:
+        use_numpy = _use_numpy(len(params))
+    simulate = _simulate_numpy if use_numpy else _simulate_python
+    summaries = simulate(start_phi, params, n_cycles) if n_cycles > 0 and params else []
+    return [{'params': p, **summary} for p, summary in zip(params, summaries)]
+
+
+def _parse_grid(args):
+    """Cartesian product of the comma-separated --<param> values"""
+    axes = []
+    for key in DEFAULT_PARAMS:
+        raw = getattr(args, key)
+        if raw is not None:
+            axes.append([(key, float(v)) for v in raw.split(',')])
+    return [dict(combo) for combo in itertools.product(*axes)] or [{}]
+
+
+def run_batch(args):
+    if args.params:
+        with open(args.params, 'r', encoding='utf-8') as f:
+            param_sets = json.load(f)
+    else:
+        param_sets = _parse_grid(args)
+
+    started = datetime.utcnow()
+    use_numpy = _use_numpy(len(param_sets))
+    results = simulate_batch(param_sets, args.batch, args.start_phi, use_numpy)
+    summary = {
+        'timestamp': started.isoformat(),
+        'cycles': args.batch,
+        'parameter_sets': len(results),
+        'backend': 'numpy' if use_numpy else 'python',
+        'elapsed_s': (datetime.utcnow() - started).total_seconds(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(f"✅ {len(results)} parameter sets × {args.batch} cycles "
+          f"({summary['backend']}, {summary['elapsed_s']:.2f}s) → {args.output}")
+    return True
+
+
 def main():
+    parser = argparse.ArgumentParser(description="NEXUS standalone evolution")
+    parser.add_argument('--batch', type=int, metavar='N',
+                        help="simulate N cycles per parameter set instead of one real cycle")
+    parser.add_argument('--params', help="JSON file with a list of parameter sets")
+    parser.add_argument('--start-phi', type=float, default=None)
+    parser.add_argument('--output', default='simulation_summary.json')
+    for key in DEFAULT_PARAMS:
+        parser.add_argument('--' + key.replace('_', '-'), dest=key,
+                            help=f"comma-separated values (default {DEFAULT_PARAMS[key]})")
+    args = parser.parse_args()
+
     try:
-        engine = EvolutionEngine()
-        success = engine.run_cycle()
+        if args.batch is not None:
+            success = run_batch(args)
+        else:
+            engine = EvolutionEngine()
+            success = engine.run_cycle()
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"❌ Fatal error: {e}", file=sys.stderr)